@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from game_core import (Game, Difficulty, Inputs, NO_INPUT, NOOP, UP, DOWN, LEFT, RIGHT,
+                       GRID_SIZE, BASE_FPS, FPS_INCREMENT)
+
+# Runs many headless episodes of game_core.Game over a grid of
+# difficulty settings on a process pool, for tuning without playing by
+# hand. Every episode has its own seed. Finished episodes are appended
+# to a JSON lines file as they come in; running the same sweep again
+# skips the episodes already in the file, so an interrupted sweep
+# resumes where it stopped. Example:
+#   python batch_sim.py --num-cars 2-4 3-5 --speed 2-5 3-6 --episodes 2000 --out sweep.jsonl
+
+DECISION_TICKS = 6  # A policy picks a move every this many ticks (5 moves/s at 1x)
+
+
+# Policies: (game, rng) -> move action, asked every DECISION_TICKS ticks
+
+def random_policy(game, rng):
+    return rng.choice((UP, UP, UP, DOWN, LEFT, RIGHT, NOOP))
+
+
+def up_policy(game, rng):
+    return UP
+
+
+# Moves up when the row above is free now and after the cars move for
+# a while, otherwise waits
+def cautious_policy(game, rng):
+    player = game.player
+    target_y = player.y - GRID_SIZE
+    if target_y < 0 or target_y >= game.safe_zone_top:
+        return UP
+    cars = game.cars
+    # Look ahead until the next decision: a car moves its speed in pixels
+    # every tick, at most the top of the configured speed range
+    margin = DECISION_TICKS * max(abs(speed) for speed in game.difficulty.speed)
+    if cars.hits(player.x - margin, target_y, player.width + 2 * margin, player.height):
+        return NOOP
+    return UP
+
+
+POLICIES = {"random": random_policy, "up": up_policy, "cautious": cautious_policy}
+
+
+def run_episode(difficulty, policy, seed, max_ticks):
+    game = Game(seed=seed, difficulty=difficulty)
+    rng = random.Random(seed)
+    choose = POLICIES[policy]
+    while not game.game_over and game.tick < max_ticks:
+        if game.tick % DECISION_TICKS == 0:
+            move = choose(game, rng)
+            game.step(Inputs(move, release=True) if move != NOOP else NO_INPUT)
+        else:
+            game.step()
+    return {"seed": seed, "score": game.score, "ticks": game.tick, "survival": game.run_time,
+            "crossings": game.crossings, "died": game.game_over}
+
+
+# One unit of work for the pool: a batch of seeds for one parameter set
+def run_chunk(key, difficulty, policy, seeds, max_ticks):
+    difficulty = Difficulty(*difficulty)
+    return key, [run_episode(difficulty, policy, seed, max_ticks) for seed in seeds]
+
+
+def parse_range(text):
+    low, _, high = text.partition("-")
+    return int(low), int(high or low)
+
+
+def format_range(pair):
+    return f"{pair[0]}-{pair[1]}"
+
+
+def parameter_sets(args):
+    for num_cars, speed, width, fps_increment, policy in itertools.product(
+            args.num_cars, args.speed, args.car_width, args.fps_increment, args.policy):
+        difficulty = Difficulty(num_cars, speed, width, fps_increment)
+        key = (f"cars={format_range(num_cars)} speed={format_range(speed)} "
+               f"width={format_range(width)} fps_inc={fps_increment} policy={policy}")
+        yield key, difficulty, policy
+
+
+# Seeds already in the output file, per parameter set. A line cut short
+# by an interrupted write is ignored (that episode runs again).
+def load_done(path):
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            done.setdefault(record["params"], set()).add(record["seed"])
+    return done
+
+
+# Cuts a line left half written by an interrupted run off the end of the
+# output file, so the next record appended starts on a line of its own
+def trim_partial_line(path):
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(0, end - 4096)
+            file.seek(start)
+            block = file.read(end - start)
+            newline = block.rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        file.truncate(end)
+
+
+# Per parameter set. An episode that reached --max-seconds did not die:
+# its survival time is only a lower bound (censored), so survival is
+# averaged over the episodes that died and the capped share is reported
+# next to it. Both survival values are None when no episode died.
+def summarize(path):
+    stats = {}
+    with open(path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            entry = stats.setdefault(record["params"], {"episodes": 0, "score": 0, "survival": [],
+                                                        "crossed": 0, "crossings": 0})
+            entry["episodes"] += 1
+            entry["score"] += record["score"]
+            if record["died"]:
+                entry["survival"].append(record["survival"])
+            entry["crossings"] += record["crossings"]
+            entry["crossed"] += record["crossings"] > 0
+    summary = {}
+    for key, entry in stats.items():
+        episodes = entry["episodes"]
+        survival = sorted(entry["survival"])
+        deaths = len(survival)
+        summary[key] = {
+            "episodes": episodes,
+            "mean_score": entry["score"] / episodes,
+            "death_rate": deaths / episodes,
+            "capped_rate": (episodes - deaths) / episodes,     # Still alive at the cap
+            "mean_survival_s": sum(survival) / deaths if deaths else None,
+            "median_survival_s": survival[deaths // 2] if deaths else None,
+            "crossing_rate": entry["crossed"] / episodes,      # Episodes with a crossing
+            "mean_crossings": entry["crossings"] / episodes,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless difficulty sweep on a process pool")
+    parser.add_argument("--num-cars", type=parse_range, nargs="+", default=[(2, 4)], help="cars per lane, LOW-HIGH")
+    parser.add_argument("--speed", type=parse_range, nargs="+", default=[(2, 5)], help="car speed, LOW-HIGH")
+    parser.add_argument("--car-width", type=parse_range, nargs="+", default=[(GRID_SIZE * 2, GRID_SIZE * 3)],
+                        help="car width in pixels, LOW-HIGH")
+    parser.add_argument("--fps-increment", type=int, nargs="+", default=[FPS_INCREMENT])
+    parser.add_argument("--policy", nargs="+", choices=sorted(POLICIES), default=["cautious"])
+    parser.add_argument("--episodes", type=int, default=1000, help="episodes per parameter set")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--max-seconds", type=float, default=120, help="episode length cap at 1x speed")
+    parser.add_argument("--chunk", type=int, default=50, help="episodes per pool task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="sweep.jsonl")
+    args = parser.parse_args()
+
+    max_ticks = int(args.max_seconds * BASE_FPS)
+    trim_partial_line(args.out)
+    done = load_done(args.out)
+    start = time.perf_counter()
+    episodes = 0
+    with ProcessPoolExecutor(args.workers) as pool, open(args.out, "a") as out:
+        futures = []
+        for key, difficulty, policy in parameter_sets(args):
+            finished = done.get(key, set())
+            seeds = [seed for seed in range(args.seed, args.seed + args.episodes) if seed not in finished]
+            for i in range(0, len(seeds), args.chunk):
+                futures.append(pool.submit(run_chunk, key, tuple(difficulty), policy,
+                                           seeds[i:i + args.chunk], max_ticks))
+        skipped = sum(len(seeds) for seeds in done.values())
+        print(f"{len(futures)} chunks to run, {skipped} episodes already in {args.out}")
+        for future in as_completed(futures):
+            key, results = future.result()
+            # One write per chunk, flushed, so an interrupt loses at most the chunks in flight
+            out.write("".join(json.dumps({"params": key, **result}) + "\n" for result in results))
+            out.flush()
+            episodes += len(results)
+    elapsed = time.perf_counter() - start
+    print(f"{episodes} episodes in {elapsed:.1f}s ({episodes / max(elapsed, 1e-9):.0f}/s)")
+
+    for key, entry in summarize(args.out).items():
+        if entry["mean_survival_s"] is None:
+            survival = "no deaths"
+        else:
+            survival = (f"survival until death {entry['mean_survival_s']:.1f}s "
+                        f"(median {entry['median_survival_s']:.1f}s)")
+        print(f"{key}: {entry['episodes']} episodes, score {entry['mean_score']:.2f}, "
+              f"died {entry['death_rate']:.0%}, capped {entry['capped_rate']:.0%}, {survival}, "
+              f"crossed {entry['crossing_rate']:.0%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Collision query time vs. number of lanes and cars for the car stores in
+# car_store.py. The scan tests every car, the lane index only the
+# player's lane. Run from anywhere:
+#   python benchmarks/bench_collision.py [--json results.json]
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from car_store import make_car_store, np
+from game_core import Car, GRID_SIZE, WIDTH, CAR_COLORS
+
+BACKENDS = ["list", "lanes"] + (["numpy"] if np is not None else [])
+
+
+# rows road lanes with cars_per_lane cars each, like generate_cars
+def make_cars(rng, rows, cars_per_lane):
+    cars = []
+    for row in range(rows):
+        speed = rng.randint(2, 5) * rng.choice([-1, 1])
+        spacing = WIDTH // cars_per_lane
+        for j in range(cars_per_lane):
+            cars.append(Car(j * spacing + rng.randint(0, spacing // 2), row * GRID_SIZE + 2,
+                            rng.randint(GRID_SIZE * 2, GRID_SIZE * 3), speed, rng.choice(CAR_COLORS)))
+    return cars
+
+
+def time_queries(store, rows, queries, rng):
+    width = height = GRID_SIZE * 0.9
+    points = [(rng.randrange(0, WIDTH, GRID_SIZE), rng.randrange(rows) * GRID_SIZE) for _ in range(queries)]
+    start = time.perf_counter()
+    for x, y in points:
+        store.hits(x, y, width, height)
+    return (time.perf_counter() - start) / queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Collision query time per car store")
+    parser.add_argument("--lanes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--cars-per-lane", type=int, nargs="+", default=[3, 12])
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'lanes':>6} {'cars':>7} " + " ".join(f"{name + ' us':>10}" for name in BACKENDS))
+    for rows in args.lanes:
+        for per_lane in args.cars_per_lane:
+            rng = random.Random(args.seed)
+            cars = make_cars(rng, rows, per_lane)
+            row = {"lanes": rows, "cars": len(cars)}
+            for backend in BACKENDS:
+                store = make_car_store(cars, GRID_SIZE, backend)
+                store.move(WIDTH)  # Queries follow a tick like in the game
+                row[backend + "_us"] = time_queries(store, rows, args.queries, random.Random(args.seed)) * 1e6
+            results.append(row)
+            print(f"{rows:>6} {len(cars):>7} " + " ".join(f"{row[name + '_us']:>10.2f}" for name in BACKENDS))
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+# Frame time per component for both games, with no window (SDL dummy
+# video driver). Each frame is timed piece by piece: simulation (car
+# move plus collision), background, portal, cars, player, HUD and the
+# display flip. Run from anywhere:
+#   python benchmarks/bench_frame.py [--json results.json]
+# and compare two result files to spot regressions.
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+GAME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, GAME_DIR)
+
+import pygame
+import legacy_game
+from car_store import make_car_store
+from game_core import Game, Car, GRID_SIZE, CAR_COLORS
+from renderer import Renderer, draw_lanes, draw_portal, BLACK
+
+COMPONENTS = ["sim", "background", "portal", "cars", "player", "hud", "flip", "frame"]
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+# p50/p95/p99 in milliseconds for each component
+def summarize(samples):
+    summary = {}
+    for name, values in samples.items():
+        values = sorted(values)
+        summary[name] = {
+            "p50_ms": percentile(values, 0.50) / 1e6,
+            "p95_ms": percentile(values, 0.95) / 1e6,
+            "p99_ms": percentile(values, 0.99) / 1e6,
+            "mean_ms": sum(values) / len(values) / 1e6,
+        }
+    return summary
+
+
+# Runs frames of a game, timing the named steps of each one
+class FrameTimer:
+    def __init__(self, names):
+        self.samples = {name: [] for name in names}
+        self.record = True
+
+    def run(self, name, function, *args):
+        start = time.perf_counter_ns()
+        function(*args)
+        elapsed = time.perf_counter_ns() - start
+        if self.record:
+            self.samples[name].append(elapsed)
+        return elapsed
+
+
+# Road lane cars spread over the rows of a game_core world, like
+# generate_cars but with a fixed total
+def make_cars(rng, count, world_width, world_height):
+    rows = [row for row in range(-5, (world_height - GRID_SIZE * 3) // GRID_SIZE) if row % 2 == 1]
+    per_lane = max(1, -(-count // len(rows)))
+    spacing = max(1, world_width // per_lane)
+    cars = []
+    for row in rows:
+        speed = rng.randint(2, 5) * rng.choice([-1, 1])
+        for j in range(per_lane):
+            if len(cars) == count:
+                return cars
+            cars.append(Car(j * spacing + rng.randint(0, spacing // 2), row * GRID_SIZE + 2,
+                            rng.randint(GRID_SIZE * 2, GRID_SIZE * 3), speed, rng.choice(CAR_COLORS)))
+    return cars
+
+
+# "Urho - PU.py": game_core.Game drawn by renderer.Renderer with full
+# redraws, so every frame pays for every component
+def bench_urho(size, car_count, frames, warmup, seed, car_store):
+    width, height = size
+    screen = pygame.display.set_mode(size)
+    game = Game(seed=seed, world_width=width, world_height=height, car_store=car_store)
+    if car_count:
+        game.cars = make_car_store(make_cars(random.Random(seed), car_count, width, height),
+                                   GRID_SIZE, car_store)
+    renderer = Renderer(screen, game, dirty_rects=False)
+    player = game.player
+    # game.step() skips the collision query while the chicken is in the
+    # safe zone, so query a road lane directly
+    probe_y = GRID_SIZE + 2
+
+    def simulate():
+        game.cars.move(width)
+        game.cars.hits(player.x, probe_y, player.width, player.height)
+
+    def background():
+        screen.fill(BLACK)
+        draw_lanes(screen, game.lanes, width, height)
+
+    timer = FrameTimer(COMPONENTS)
+    for frame in range(warmup + frames):
+        timer.record = frame >= warmup
+        rects = []
+        total = timer.run("sim", simulate)
+        player.animate()
+        game.portal_frame = (game.portal_frame + 0.1) % 20
+        total += timer.run("background", background)
+        total += timer.run("portal", draw_portal, screen, game.portal_frame, width)
+        total += timer.run("cars", renderer.draw_cars, game.cars, 1.0, rects)
+        total += timer.run("player", renderer.draw_player, player, rects)
+        total += timer.run("hud", renderer.draw_hud, game, rects)
+        total += timer.run("flip", pygame.display.flip)
+        if timer.record:
+            timer.samples["frame"].append(total)
+    return len(game.cars), timer.samples
+
+
+# "import pygame.py" imported as a module for its drawing functions
+# (its game loop only runs as a script)
+def load_legacy():
+    spec = importlib.util.spec_from_file_location("crossy_legacy", os.path.join(GAME_DIR, "import pygame.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench_legacy(size, car_count, frames, warmup, seed):
+    rng = random.Random(seed)
+    legacy = load_legacy()
+    width, height = size
+    game = legacy_game.Game(seed, width, height)
+    if car_count:
+        # Spread the cars over the road lanes and across the screen
+        lanes = list(range(height - GRID_SIZE * 3, GRID_SIZE * 3, -GRID_SIZE * 2))
+        game.cars = []
+        for i in range(car_count):
+            car = legacy_game.Car(lanes[i % len(lanes)], rng.choice(legacy_game.CAR_SPEEDS), rng, width)
+            car.x = rng.randrange(-car.width, width)
+            game.cars.append(car)
+    screen = pygame.display.set_mode(size)
+    safe_area = pygame.Rect(0, 0, width, legacy_game.SAFE_AREA_HEIGHT)
+    score_label = legacy.CachedText(legacy.get_font('Arial', 28, bold=True), "Score: {}")
+    grass_textures = legacy.GrassTextures(safe_area.size, legacy.GREEN, legacy.DARK_GREEN, legacy.GRASS_SEED,
+                                          legacy.GRASS_VARIANTS, legacy.GRASS_SHIMMER_FRAMES)
+
+    def simulate():
+        for car in game.cars:
+            car.move()
+        game.check_collision()
+
+    def background():
+        screen.fill(legacy.DARK_GREEN)
+        legacy.draw_road(screen)
+        legacy.draw_grass_area(screen, grass_textures, safe_area)
+
+    def draw_cars():
+        for car in game.cars:
+            legacy.draw_car(screen, car)
+
+    names = [name for name in COMPONENTS if name != "portal"]  # No portal in this game
+    timer = FrameTimer(names)
+    for frame in range(warmup + frames):
+        timer.record = frame >= warmup
+        total = timer.run("sim", simulate)
+        total += timer.run("background", background)
+        total += timer.run("cars", draw_cars)
+        total += timer.run("player", legacy.draw_player, screen, game.player)
+        total += timer.run("hud", legacy.draw_score, screen, score_label, game.score)
+        total += timer.run("flip", pygame.display.flip)
+        if timer.record:
+            timer.samples["frame"].append(total)
+    return len(game.cars), timer.samples
+
+
+def parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame time per component for both games")
+    parser.add_argument("--games", nargs="+", choices=["urho", "legacy"], default=["urho", "legacy"])
+    parser.add_argument("--sizes", type=parse_size, nargs="+",
+                        default=[(400, 600), (920, 800), (1920, 1080)], help="window sizes, WxH")
+    parser.add_argument("--cars", type=int, nargs="+", default=[0, 100, 1000],
+                        help="number of cars (0 = the game's own layout)")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--car-store", default="lanes", help="car store of the Urho game")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    pygame.init()
+    results = []
+    print(f"{'game':>7} {'size':>10} {'cars':>6} " +
+          " ".join(f"{name:>10}" for name in COMPONENTS) + "   (p50 ms)")
+    for game in args.games:
+        for size in args.sizes:
+            for car_count in args.cars:
+                if game == "urho":
+                    cars, samples = bench_urho(size, car_count, args.frames, args.warmup,
+                                               args.seed, args.car_store)
+                else:
+                    cars, samples = bench_legacy(size, car_count, args.frames, args.warmup, args.seed)
+                summary = summarize(samples)
+                results.append({"game": game, "width": size[0], "height": size[1],
+                                "cars": cars, "frames": args.frames, "components": summary})
+                print(f"{game:>7} {size[0]:>4}x{size[1]:<5} {cars:>6} " +
+                      " ".join(f"{summary[name]['p50_ms']:>10.3f}" if name in summary else f"{'-':>10}"
+                               for name in COMPONENTS))
+    pygame.quit()
+
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"python": platform.python_version(),
+                       "pygame": pygame.version.ver,
+                       "video_driver": os.environ["SDL_VIDEODRIVER"],
+                       "results": results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+import json
+import multiprocessing
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+
+# Frame capture for bug report videos. The game thread only copies the
+# display surface's pixels (one memcpy through its buffer view) into a
+# free slot of a ring of preallocated shared memory frames and hands the
+# slot number to an encoder process, which writes the frame and gives
+# the slot back. When the encoder falls behind and no slot is free the
+# frame is dropped and counted instead of waiting.
+#
+# Formats:
+#   png  one frame_000000.png per captured frame
+#   raw  all frames in capture.raw, as the surface stores them; the
+#        width, height, pitch and pixel format are in capture.json:
+#        ffmpeg -f rawvideo -pixel_format bgr0 -video_size 920x800
+#               -framerate 120 -i capture.raw capture.mp4
+# Encoding runs in a process, not a thread: pygame's PNG writer keeps
+# the GIL for tens of milliseconds per frame.
+
+RING_FRAMES = 8  # Frames waiting for the encoder at most
+START_TIMEOUT = 10  # Seconds the encoder process may take to start
+FORMATS = ("png", "raw")
+
+
+# Byte offsets of red, green and blue in a pixel, from the surface masks
+# (pixels are stored little endian)
+def channel_offsets(surface):
+    return tuple(mask.bit_length() // 8 - 1 for mask in surface.get_masks()[:3])
+
+
+class FrameCapture:
+    # every: capture every Nth frame; fps is only written to capture.json.
+    # Raises RuntimeError when the encoder process doesn't start (e.g. png
+    # without NumPy), so nothing pretends to record.
+    def __init__(self, directory, surface, every=1, file_format="png", fps=None, ring_frames=RING_FRAMES):
+        if file_format not in FORMATS:
+            raise ValueError(f"unknown capture format {file_format!r}, expected one of {FORMATS}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.every = max(1, every)
+        self.file_format = file_format
+        self.fps = fps
+        self.size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.bytesize = surface.get_bytesize()
+        self.channels = channel_offsets(surface)
+        self.frame_bytes = self.pitch * self.size[1]
+        self.ring = [shared_memory.SharedMemory(create=True, size=self.frame_bytes) for _ in range(ring_frames)]
+
+        context = multiprocessing.get_context("spawn")  # No forked copy of SDL
+        self.free = context.Queue()
+        self.filled = context.Queue()
+        for slot in range(ring_frames):
+            self.free.put(slot)
+        ready = context.Event()
+        self.worker = context.Process(
+            target=encode_frames, name="frame-capture", daemon=True,
+            args=([memory.name for memory in self.ring], self.filled, self.free, ready, directory, file_format,
+                  self.size, self.pitch, self.bytesize, self.channels))
+        self.worker.start()
+        # Starting the process takes a while; better here than in the first frames
+        started = time.monotonic()
+        while not ready.wait(0.1):
+            if not self.worker.is_alive():
+                self.discard()
+                raise RuntimeError(f"Frame capture encoder exited with code {self.worker.exitcode}")
+            if time.monotonic() - started > START_TIMEOUT:
+                self.discard()
+                raise RuntimeError("Frame capture encoder didn't start")
+        self.frames = 0    # Frames seen
+        self.captured = 0  # Frames handed to the encoder
+        self.dropped = 0   # Frames skipped because the ring was full
+
+    # Called from the game thread after drawing; never waits for the encoder
+    def capture(self, surface):
+        self.frames += 1
+        if (self.frames - 1) % self.every:
+            return False
+        try:
+            slot = self.free.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        pixels = surface.get_buffer()
+        view = memoryview(pixels)
+        self.ring[slot].buf[:self.frame_bytes] = view
+        view.release()
+        del pixels  # Unlocks the surface
+        self.filled.put((slot, self.captured))
+        self.captured += 1
+        return True
+
+    # Stops an encoder that never got going and frees the ring
+    def discard(self):
+        if self.worker.is_alive():
+            self.worker.terminate()
+        self.worker.join()
+        for memory in self.ring:
+            memory.close()
+            memory.unlink()
+
+    # Waits for the encoder to write what it has, frees the ring
+    def close(self):
+        self.filled.put(None)
+        self.worker.join()
+        for memory in self.ring:
+            memory.close()
+            memory.unlink()
+        with open(os.path.join(self.directory, "capture.json"), "w") as file:
+            json.dump({
+                "format": self.file_format,
+                "width": self.size[0],
+                "height": self.size[1],
+                "pitch": self.pitch,
+                "bytes_per_pixel": self.bytesize,
+                "channels": self.channels,
+                "fps": self.fps,
+                "every": self.every,
+                "captured": self.captured,
+                "dropped": self.dropped,
+            }, file, indent=1)
+
+    def stats(self):
+        return {"frames": self.frames, "captured": self.captured, "dropped": self.dropped}
+
+
+# The encoder process: writes the frames in the order they come and
+# returns each slot to the free queue
+def encode_frames(names, filled, free, ready, directory, file_format, size, pitch, bytesize, channels):
+    ring = [shared_memory.SharedMemory(name=name) for name in names]
+    width, height = size
+    frame_bytes = pitch * height
+    raw_file = open(os.path.join(directory, "capture.raw"), "wb") if file_format == "raw" else None
+    if file_format == "png":
+        import numpy as np
+        import pygame
+    ready.set()
+    try:
+        while True:
+            item = filled.get()
+            if item is None:
+                break
+            slot, number = item
+            data = ring[slot].buf[:frame_bytes]
+            if raw_file is not None:
+                raw_file.write(data)
+            else:
+                # Rows of the pitch, pixels of bytesize, picked into RGB
+                pixels = np.frombuffer(data, dtype=np.uint8).reshape(height, pitch)
+                pixels = pixels[:, :width * bytesize].reshape(height, width, bytesize)
+                rgb = np.ascontiguousarray(pixels[:, :, list(channels)])
+                image = pygame.image.frombuffer(rgb.tobytes(), size, "RGB")
+                pygame.image.save(image, os.path.join(directory, f"frame_{number:06d}.png"))
+                del pixels, rgb
+            data.release()
+            free.put(slot)
+    finally:
+        if raw_file is not None:
+            raw_file.close()
+        for memory in ring:
+            memory.close()
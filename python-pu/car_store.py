@@ -0,0 +1,181 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, CarList works without it
+    np = None
+
+# Containers for the cars of a game_core.Game. Both kinds offer
+#   move(world_width)  advance every car one tick (same rules as Car.move)
+#   freeze()           cars stand still this tick (nothing to interpolate)
+#   hits(x, y, w, h)   does any car overlap that box (player collision)
+# and iterate over car-like objects for drawing.
+
+
+# Whether a car overlaps the box (x, y, width, height)
+def overlaps(car, x, y, width, height):
+    return (y < car.y + car.height and
+            y + height > car.y and
+            x < car.x + car.width and
+            x + width > car.x)
+
+
+# Plain list of (slotted) game_core.Car objects
+class CarList(list):
+    # Take other cars (a restart), keeping this store
+    def refill(self, cars):
+        self[:] = cars
+
+    def move(self, world_width):
+        for car in self:
+            car.move(world_width)
+
+    def freeze(self):
+        for car in self:
+            car.prev_x = car.x
+
+    def hits(self, x, y, width, height):
+        for car in self:
+            if overlaps(car, x, y, width, height):
+                return True
+        return False
+
+
+# CarList with a per-lane index: lane row -> cars sorted by x. Cars never
+# change lanes, so a collision query only looks at the rows the box
+# covers and bisects to the cars near it; its cost does not grow with
+# the total number of cars.
+class LaneIndexedCarList(CarList):
+    def __init__(self, cars, grid_size):
+        super().__init__()
+        self.grid_size = grid_size
+        self.lanes = {}
+        self.max_width = {}
+        self.wrapped = set()  # Rows to re-sort after a move, reused
+        self.refill(cars)
+
+    # The lane lists are emptied and filled again, not re-created
+    def refill(self, cars):
+        self[:] = cars
+        for lane in self.lanes.values():
+            del lane[:]
+        for car in self:
+            for row in self.rows(car.y, car.height):
+                self.lanes.setdefault(row, []).append(car)
+        for row, lane in self.lanes.items():
+            lane.sort(key=car_x)
+            self.max_width[row] = max((car.width for car in lane), default=0)
+
+    def rows(self, y, height):
+        return range(int(y // self.grid_size), int((y + height - 1) // self.grid_size) + 1)
+
+    def move(self, world_width):
+        wrapped = self.wrapped
+        for car in self:
+            if car.move(world_width):
+                wrapped.update(self.rows(car.y, car.height))
+        # Moving keeps a lane in order, only wrapped cars jump to the other
+        # end. Timsort puts such a nearly sorted lane back in linear time.
+        if wrapped:
+            for row in wrapped:
+                self.lanes[row].sort(key=car_x)
+            wrapped.clear()
+
+    def hits(self, x, y, width, height):
+        for row in self.rows(y, height):
+            lane = self.lanes.get(row)
+            if not lane:
+                continue
+            # Only cars starting in (x - widest car, x + width) can overlap
+            start = bisect_right(lane, x - self.max_width[row], key=car_x)
+            end = bisect_left(lane, x + width, key=car_x)
+            for i in range(start, end):
+                if overlaps(lane[i], x, y, width, height):
+                    return True
+        return False
+
+
+def car_x(car):
+    return car.x
+
+
+# What iterating over a NumpyCarStore yields
+CarView = namedtuple("CarView", "x prev_x y width height speed color direction lane")
+
+
+# Struct-of-arrays car store: one contiguous array per attribute, so
+# moving, wrapping and the collision test are a few vectorized
+# operations no matter how many cars there are.
+class NumpyCarStore:
+    def __init__(self, cars, grid_size):
+        if np is None:
+            raise RuntimeError("NumpyCarStore needs NumPy, use CarList instead")
+        self.grid_size = grid_size
+        self.palette = []
+        color_index = {}
+        for car in cars:
+            if car.color not in color_index:
+                color_index[car.color] = len(self.palette)
+                self.palette.append(car.color)
+
+        self.x = np.array([car.x for car in cars], dtype=np.float64)
+        self.prev_x = np.array([car.prev_x for car in cars], dtype=np.float64)
+        self.y = np.array([car.y for car in cars], dtype=np.float64)
+        self.width = np.array([car.width for car in cars], dtype=np.float64)
+        self.neg_width = -self.width
+        self.height = np.array([car.height for car in cars], dtype=np.float64)
+        self.speed = np.array([car.speed for car in cars], dtype=np.float64)
+        self.lane = np.array([car.y // grid_size for car in cars], dtype=np.int32)
+        self.color = np.array([color_index[car.color] for car in cars], dtype=np.uint8)
+        self.moving_right = self.speed > 0
+        self.moving_left = self.speed < 0
+        # Scratch buffers so move() allocates nothing
+        self._wrap = np.zeros(len(self.x), dtype=bool)
+        self._wrap_left = np.zeros(len(self.x), dtype=bool)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __iter__(self):
+        palette = self.palette
+        for i in range(len(self.x)):
+            speed = self.speed[i]
+            yield CarView(self.x[i], self.prev_x[i], self.y[i], self.width[i], self.height[i],
+                          speed, palette[self.color[i]], 1 if speed > 0 else -1, self.lane[i])
+
+    def move(self, world_width):
+        x = self.x
+        self.prev_x[:] = x
+        x += self.speed
+        # Cars leaving on the right come back in on the left and vice versa
+        wrap = np.greater(x, world_width, out=self._wrap)
+        wrap &= self.moving_right
+        np.copyto(x, self.neg_width, where=wrap)
+        wrap_left = np.less(x, self.neg_width, out=self._wrap_left)
+        wrap_left &= self.moving_left
+        np.copyto(x, world_width, where=wrap_left)
+        # Don't interpolate across the wrap
+        wrap |= wrap_left
+        np.copyto(self.prev_x, x, where=wrap)
+
+    def freeze(self):
+        self.prev_x[:] = self.x
+
+    def hits(self, x, y, width, height):
+        overlap = ((y < self.y + self.height) &
+                   (y + height > self.y) &
+                   (x < self.x + self.width) &
+                   (x + width > self.x))
+        return bool(overlap.any())
+
+
+# backend: "lanes", "list", "numpy" or "auto" (NumPy when it is installed)
+def make_car_store(cars, grid_size, backend="lanes"):
+    if backend == "auto":
+        backend = "numpy" if np is not None else "lanes"
+    if backend == "numpy":
+        return NumpyCarStore(cars, grid_size)
+    if backend == "lanes":
+        return LaneIndexedCarList(cars, grid_size)
+    return CarList(cars)
@@ -0,0 +1,186 @@
+import random
+from game_core import Game, CarPool, NO_INPUT, GRID_SIZE, MAX_SIM_SPEED, generate_lane
+from car_store import overlaps
+
+# Endless mode: instead of the portal at the top, the world goes on
+# upward and the view scrolls with the player. Rows are made in chunks
+# of CHUNK_ROWS when they come near the view and kept in a ring of
+# chunks; the chunk that scrolls off the bottom is refilled (lanes and
+# the same Car objects) as the next one above. Memory and work per tick
+# stay the same however far the player gets.
+#
+# World coordinates are those of the normal game (row 0 at the top of
+# the starting view) and continue upward into negative rows. Lanes keep
+# the (type, y) model: odd rows are road, even rows grass, the starting
+# rows at the bottom are the safe zone.
+
+CHUNK_ROWS = 8
+ROWS_ABOVE_VIEW = 5      # Rows kept ready above the top of the view (like rows -5..-1)
+CAMERA_FOLLOW_ROWS = 12  # The view scrolls up once the player is this many rows from its bottom
+CAMERA_SPEED = 4         # Pixels per tick the view scrolls at least (a quarter of the gap when more)
+SPEEDUP_ROWS = 20        # Rows of progress per speed-up (a screen, as one portal crossing)
+
+
+class LaneChunk:
+    def __init__(self):
+        self.index = None
+        self.lanes = []
+        self.cars = []
+        self.car_pool = CarPool()  # This chunk's Car objects between fills
+
+    # Rows index * CHUNK_ROWS ... + CHUNK_ROWS - 1, reusing this chunk's
+    # lane list and Car objects
+    def fill(self, index, rng, world_width, safe_zone_row, difficulty):
+        self.index = index
+        first_row = index * CHUNK_ROWS
+        lanes = self.lanes
+        del lanes[:]
+        cars = self.cars
+        self.car_pool.release(cars)
+        del cars[:]
+        for row in range(first_row, first_row + CHUNK_ROWS):
+            lane_y = row * GRID_SIZE
+            if row >= safe_zone_row:
+                lanes.append(("safe_zone", lane_y))
+            elif row % 2 == 1:
+                lanes.append(("road", lane_y))
+                generate_lane(rng, lane_y, cars, self.car_pool.acquire, world_width, difficulty)
+            else:
+                lanes.append(("grass", lane_y))
+
+
+# The chunks covering the view plus ROWS_ABOVE_VIEW rows above it, in a
+# fixed-size list indexed by chunk index modulo its length
+class ChunkRing:
+    def __init__(self, run_seed, world_width, view_height, difficulty):
+        self.world_width = world_width
+        self.difficulty = difficulty
+        self.view_rows = view_height // GRID_SIZE
+        self.safe_zone_row = self.view_rows - 4
+        self.size = -(-(self.view_rows + ROWS_ABOVE_VIEW) // CHUNK_ROWS) + 1
+        self.chunks = [LaneChunk() for _ in range(self.size)]
+        self.start(run_seed)
+
+    # Back to the starting rows, for a new run
+    def start(self, run_seed):
+        self.run_seed = run_seed
+        self.bottom = (self.view_rows - 1) // CHUNK_ROWS  # Index of the lowest chunk
+        for index in range(self.bottom - self.size + 1, self.bottom + 1):
+            self.fill(index)
+
+    def fill(self, index):
+        # Each chunk has its own generator, so a chunk is the same
+        # whenever it is made
+        rng = random.Random(f"{self.run_seed}:{index}")
+        self.chunks[index % self.size].fill(index, rng, self.world_width, self.safe_zone_row, self.difficulty)
+
+    def chunk_at_row(self, row):
+        index = row // CHUNK_ROWS
+        chunk = self.chunks[index % self.size]
+        return chunk if chunk.index == index else None
+
+    # Recycle the chunks below the view as new chunks above it
+    def scroll(self, view_bottom):
+        while self.bottom * CHUNK_ROWS * GRID_SIZE >= view_bottom:
+            self.fill(self.bottom - self.size)
+            self.bottom -= 1
+
+    def lanes(self):
+        # Top to bottom, like build_lanes
+        lanes = []
+        for index in range(self.bottom - self.size + 1, self.bottom + 1):
+            lanes.extend(self.chunks[index % self.size].lanes)
+        return lanes
+
+
+# Car store over the cars of a ChunkRing (see car_store.py)
+class ChunkCars:
+    def __init__(self, ring):
+        self.ring = ring
+
+    def __iter__(self):
+        for chunk in self.ring.chunks:
+            yield from chunk.cars
+
+    def __len__(self):
+        return sum(len(chunk.cars) for chunk in self.ring.chunks)
+
+    def move(self, world_width):
+        for chunk in self.ring.chunks:
+            for car in chunk.cars:
+                car.move(world_width)
+
+    def freeze(self):
+        for chunk in self.ring.chunks:
+            for car in chunk.cars:
+                car.prev_x = car.x
+
+    def hits(self, x, y, width, height):
+        for row in range(int(y // GRID_SIZE), int((y + height - 1) // GRID_SIZE) + 1):
+            chunk = self.ring.chunk_at_row(row)
+            if chunk is None:
+                continue
+            for car in chunk.cars:
+                if overlaps(car, x, y, width, height):
+                    return True
+        return False
+
+
+class EndlessGame(Game):
+    scrolls = True
+
+    # levelgen checks the rows of one screen, not chunks made on the way
+    def __init__(self, *args, solvable=False, **kwargs):
+        if solvable:
+            raise ValueError("solvable layouts are not supported in endless mode")
+        super().__init__(*args, **kwargs)
+
+    def new_cars(self, rng):
+        if self.cars is None:
+            self.ring = ChunkRing(self.run_seed, self.world_width, self.world_height, self.difficulty)
+            return ChunkCars(self.ring)
+        self.ring.start(self.run_seed)
+        return self.cars
+
+    def restart(self):
+        super().restart()
+        self.camera_y = 0
+        self.player.top = None  # No portal, the world goes on
+        self.best_row = int(self.player.y // GRID_SIZE)
+        self.lanes = self.ring.lanes()
+
+    def move_player(self, dx, dy):
+        super().move_player(dx, dy)
+        row = int(self.player.y // GRID_SIZE)
+        if row < self.best_row:
+            self.best_row = row
+            start_row = int((self.world_height - GRID_SIZE * 2) // GRID_SIZE)
+            if (start_row - row) % SPEEDUP_ROWS == 0:
+                # Every screen of progress counts as a crossing
+                self.sim_speed = min(self.sim_speed + self.sim_speed_increment, MAX_SIM_SPEED)
+                self.max_sim_speed = max(self.max_sim_speed, self.sim_speed)
+                self.crossings += 1
+
+    # Chunks are refilled while the view scrolls, which a LanePredictor
+    # doesn't follow, so collisions are always tested here (restart
+    # makes no predictor)
+    def check_collision(self):
+        return self.player_hit()
+
+    def step(self, inputs=NO_INPUT):
+        super().step(inputs)
+        self.scroll()
+
+    # Move the view toward the player and recycle the rows it left
+    def scroll(self):
+        target = self.player.y - (self.world_height - CAMERA_FOLLOW_ROWS * GRID_SIZE)
+        if target < self.camera_y:
+            self.camera_y = max(target, self.camera_y - max(CAMERA_SPEED, (self.camera_y - target) / 4))
+            view_bottom = self.camera_y + self.world_height
+            bottom = self.ring.bottom
+            self.ring.scroll(view_bottom)
+            if self.ring.bottom != bottom:
+                self.lanes = self.ring.lanes()
+            # The player can't go below the view
+            self.player.bottom = min(self.player.bottom,
+                                     (view_bottom // GRID_SIZE - 2) * GRID_SIZE)
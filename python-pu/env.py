@@ -0,0 +1,258 @@
+import numpy as np
+from game_core import (Game, Inputs, NO_INPUT, NOOP, UP, DOWN, LEFT, RIGHT, MOVES,
+                       DEFAULT_DIFFICULTY, GRID_SIZE, WIDTH, HEIGHT, lane_rows)
+
+# Environments for training agents on the rules of "Urho - PU.py", with
+# no window and no keyboard:
+#   CrossyEnv        one game_core.Game behind reset(seed)/step(action)
+#   VectorCrossyEnv  N games in NumPy arrays, stepped together
+# An action is one of game_core's NOOP, UP, DOWN, LEFT, RIGHT and is a
+# key tap: the key is released in the same step, so the agent may move
+# every step. One step is one simulation tick.
+#
+# Observation: a (rows, cols) uint8 grid over the window, one cell per
+# GRID_SIZE square, holding GRASS, ROAD, CAR or PLAYER.
+# Reward: the score gained in the step (+1 per row up).
+
+GRASS, ROAD, CAR, PLAYER = range(4)
+NUM_ACTIONS = 5
+ACTION_INPUTS = [NO_INPUT] + [Inputs(action, release=True) for action in (UP, DOWN, LEFT, RIGHT)]
+
+
+def grid_shape(world_width=WIDTH, world_height=HEIGHT):
+    return world_height // GRID_SIZE, -(-world_width // GRID_SIZE)
+
+
+def road_rows(world_height=HEIGHT):
+    return [row for row in lane_rows(world_height) if row % 2 == 1]
+
+
+# Lane types of the visible rows; cars and the player go on top
+def lane_grid(world_width=WIDTH, world_height=HEIGHT):
+    grid = np.full(grid_shape(world_width, world_height), GRASS, dtype=np.uint8)
+    for row in road_rows(world_height):
+        if 0 <= row < grid.shape[0]:
+            grid[row] = ROAD
+    return grid
+
+
+class CrossyEnv:
+    def __init__(self, difficulty=DEFAULT_DIFFICULTY, max_steps=None,
+                 world_width=WIDTH, world_height=HEIGHT):
+        self.difficulty = difficulty
+        self.max_steps = max_steps
+        self.world_width = world_width
+        self.world_height = world_height
+        self.lane_grid = lane_grid(world_width, world_height)
+        self.game = None
+        self.steps = 0
+
+    # A seed gives a new game with that seed, without one the next run
+    # of the current game starts
+    def reset(self, seed=None):
+        if seed is not None or self.game is None:
+            self.game = Game(seed=seed, world_width=self.world_width, world_height=self.world_height,
+                             difficulty=self.difficulty)
+        else:
+            self.game.restart()
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action):
+        game = self.game
+        score = game.score
+        game.step(ACTION_INPUTS[action])
+        self.steps += 1
+        done = game.game_over or (self.max_steps is not None and self.steps >= self.max_steps)
+        info = {"score": game.score, "crossings": game.crossings, "collision": game.game_over}
+        return self.observe(), game.score - score, done, info
+
+    def observe(self):
+        grid = self.lane_grid.copy()
+        rows, cols = grid.shape
+        for car in self.game.cars:
+            row = int(car.y // GRID_SIZE)
+            if 0 <= row < rows:
+                first = max(int(car.x // GRID_SIZE), 0)
+                last = min(int(-(-(car.x + car.width) // GRID_SIZE)), cols)
+                grid[row, first:last] = CAR
+        player = self.game.player
+        grid[int(player.y // GRID_SIZE), int((player.x + player.width / 2) // GRID_SIZE)] = PLAYER
+        return grid
+
+
+# num_envs games with the CrossyEnv rules, kept as arrays of shape
+# (envs, road lanes, car slots). Every step is a fixed number of NumPy
+# operations whatever the number of games, and a game that ends is
+# started again right away (its last info is in the step's info).
+#
+# The chicken always sits on a grid row (it starts on one and moves a
+# whole cell), so the collision test only looks at the cars of the lane
+# it is in. Car layouts are drawn with the same distribution as
+# generate_cars, but from a NumPy generator: a seed gives different
+# layouts than it does in CrossyEnv.
+class VectorCrossyEnv:
+    def __init__(self, num_envs, seed=None, difficulty=DEFAULT_DIFFICULTY, max_steps=None,
+                 world_width=WIDTH, world_height=HEIGHT):
+        self.num_envs = num_envs
+        self.difficulty = difficulty
+        self.max_steps = max_steps
+        self.world_width = world_width
+        self.world_height = world_height
+        self.rng = np.random.default_rng(seed)
+
+        self.rows = np.array(road_rows(world_height))
+        self.first_row = self.rows[0]
+        self.slots = difficulty.num_cars[1]
+        lanes = len(self.rows)
+        shape = (num_envs, lanes, self.slots)
+        self.car_x = np.zeros(shape)
+        self.car_width = np.zeros(shape)
+        self.car_speed = np.zeros(shape)
+        self.car_valid = np.zeros(shape, dtype=bool)
+
+        # Same player as game_core.Player
+        player = Game(seed=0, world_width=world_width, world_height=world_height).player
+        self.player_width = player.width
+        self.start_x = player.x
+        self.start_y = player.y
+        self.safe_zone_top = world_height - GRID_SIZE * 3
+        self.player_x = np.zeros(num_envs)
+        self.player_y = np.zeros(num_envs)
+        self.score = np.zeros(num_envs, dtype=np.int64)
+        self.crossings = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+
+        move = [MOVES.get(action, (0, 0)) for action in range(NUM_ACTIONS)]
+        self.action_dx = np.array([dx for dx, dy in move], dtype=np.float64) * GRID_SIZE
+        self.action_dy = np.array([dy for dx, dy in move], dtype=np.float64) * GRID_SIZE
+        self.env_index = np.arange(num_envs)
+
+        self.lane_grid = lane_grid(world_width, world_height)
+        self.grid_rows, self.grid_cols = self.lane_grid.shape
+        # Visible lanes and the row offset of their cells in the flat grid
+        self.visible_lanes = np.flatnonzero((self.rows >= 0) & (self.rows < self.grid_rows))
+        self.cell_offsets = np.arange(-(-difficulty.car_width[1] // GRID_SIZE) + 1)
+        self.grid = np.empty((num_envs, self.grid_rows, self.grid_cols), dtype=np.uint8)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.env_index)
+        return self.observe()
+
+    # New car layouts and players for the given games
+    def reset_envs(self, envs):
+        count = len(envs)
+        if count == 0:
+            return
+        rng = self.rng
+        difficulty = self.difficulty
+        lanes = len(self.rows)
+        num_cars = rng.integers(difficulty.num_cars[0], difficulty.num_cars[1] + 1, (count, lanes, 1))
+        direction = np.where(rng.random((count, lanes, 1)) > 0.5, 1, -1)
+        speed = rng.integers(difficulty.speed[0], difficulty.speed[1] + 1, (count, lanes, 1)) * direction
+        width = rng.integers(difficulty.car_width[0], difficulty.car_width[1] + 1, (count, lanes, self.slots))
+        spacing = self.world_width // num_cars
+        slot = np.arange(self.slots)
+        x = slot * spacing + rng.integers(0, spacing // 2 + 1, (count, lanes, self.slots))
+        valid = slot < num_cars
+        # Empty slots stand still far away, they never wrap or collide
+        self.car_x[envs] = np.where(valid, x, -1e9)
+        self.car_width[envs] = np.where(valid, width, 0)
+        self.car_speed[envs] = np.where(valid, speed, 0)
+        self.car_valid[envs] = valid
+        self.reset_players(envs)
+
+    def reset_players(self, envs):
+        self.player_x[envs] = self.start_x
+        self.player_y[envs] = self.start_y
+        self.score[envs] = 0
+        self.crossings[envs] = 0
+        self.steps[envs] = 0
+
+    # Start game env over with the given Car objects (e.g. a Game's cars),
+    # to play a known layout or compare with CrossyEnv
+    def load_cars(self, env, cars):
+        self.car_x[env] = -1e9
+        self.car_width[env] = 0
+        self.car_speed[env] = 0
+        self.car_valid[env] = False
+        lane_of = {row: lane for lane, row in enumerate(self.rows.tolist())}
+        used = [0] * len(self.rows)
+        for car in cars:
+            lane = lane_of[int(car.y // GRID_SIZE)]
+            slot = used[lane]
+            used[lane] += 1
+            self.car_x[env, lane, slot] = car.x
+            self.car_width[env, lane, slot] = car.width
+            self.car_speed[env, lane, slot] = car.speed
+            self.car_valid[env, lane, slot] = True
+        self.reset_players([env])
+
+    def step(self, actions, observe=True):
+        actions = np.asarray(actions)
+        world_width = self.world_width
+        dx = self.action_dx[actions]
+        dy = self.action_dy[actions]
+        moving = actions != NOOP
+
+        # Player.move: wrap around on x, portal at the top, floor at the bottom
+        new_x = self.player_x + dx
+        new_x = np.where(new_x < 0, world_width - self.player_width, new_x)
+        new_x = np.where(new_x > world_width - self.player_width, 0, new_x)
+        new_y = self.player_y + dy
+        portal = moving & (new_y < 0)
+        moved = moving & ~portal
+        new_y = np.minimum(new_y, self.world_height - GRID_SIZE * 2)
+        self.player_x = np.where(moved, new_x, np.where(portal, self.start_x, self.player_x))
+        self.player_y = np.where(moved, new_y, np.where(portal, self.start_y, self.player_y))
+        reward = (moved & (dy < 0)).astype(np.int64)
+        self.score += reward
+        self.crossings += portal
+
+        # Car.move
+        x = self.car_x
+        x += self.car_speed
+        speed = self.car_speed
+        np.copyto(x, -self.car_width, where=(speed > 0) & (x > world_width))
+        np.copyto(x, world_width, where=(speed < 0) & (x < -self.car_width))
+
+        # Collision with the cars of the player's lane (only outside the safe zone)
+        lane = (self.player_y // GRID_SIZE).astype(np.int64) - self.first_row
+        on_road = (lane % 2 == 0) & (lane >= 0) & (lane < 2 * len(self.rows)) & (self.player_y < self.safe_zone_top)
+        lane = np.where(on_road, lane // 2, 0)
+        lane_x = x[self.env_index, lane]
+        lane_width = self.car_width[self.env_index, lane]
+        player_x = self.player_x[:, None]
+        hit = ((player_x < lane_x + lane_width) & (player_x + self.player_width > lane_x)).any(axis=1)
+        hit &= on_road
+
+        self.steps += 1
+        done = hit.copy()
+        if self.max_steps is not None:
+            done |= self.steps >= self.max_steps
+        info = {"score": self.score.copy(), "crossings": self.crossings.copy(), "collision": hit}
+        self.reset_envs(np.flatnonzero(done))
+        return (self.observe() if observe else None), reward, done, info
+
+    def observe(self):
+        grid = self.grid
+        grid[:] = self.lane_grid
+        flat = grid.reshape(-1)
+        cols = self.grid_cols
+        env_base = (self.env_index * (self.grid_rows * cols))[:, None, None, None]
+
+        # Cells covered by the cars of the visible lanes
+        lanes = self.visible_lanes
+        x = self.car_x[:, lanes, :, None]
+        right = x + self.car_width[:, lanes, :, None]
+        cell = (x // GRID_SIZE).astype(np.int64) + self.cell_offsets
+        covered = (cell * GRID_SIZE < right) & (cell >= 0) & (cell < cols) & self.car_valid[:, lanes, :, None]
+        index = env_base + (self.rows[lanes] * cols)[None, :, None, None] + cell
+        flat[index[covered]] = CAR
+
+        row = (self.player_y // GRID_SIZE).astype(np.int64)
+        col = ((self.player_x + self.player_width / 2) // GRID_SIZE).astype(np.int64)
+        grid[self.env_index, row, col] = PLAYER
+        return grid
@@ -0,0 +1,360 @@
+import random
+from collections import namedtuple
+from car_store import make_car_store
+from predict import LanePredictor
+
+# Game rules of "Urho - PU.py" without pygame: importing this module
+# opens no window and initializes nothing. The pygame front end only
+# turns key presses into Inputs and draws the state (see renderer.py).
+
+# Constants
+WIDTH, HEIGHT = 920, 800
+GRID_SIZE = 40
+BASE_FPS = 30
+MAX_FPS = 120
+FPS_INCREMENT = 15
+# The simulation runs BASE_FPS ticks per second times sim_speed
+MAX_SIM_SPEED = MAX_FPS / BASE_FPS
+SIM_SPEED_INCREMENT = FPS_INCREMENT / BASE_FPS
+# portal_frame advances by PORTAL_STEP per tick and wraps at PORTAL_CYCLE
+PORTAL_STEP = 0.1
+PORTAL_CYCLE = 20
+
+# More realistic car colors
+CAR_COLORS = [
+    (200, 50, 50),    # Red
+    (50, 50, 200),     # Blue
+    (50, 200, 50),     # Green
+    (200, 200, 50),    # Yellow
+    (180, 180, 180),   # Silver
+    (100, 50, 0)       # Brown
+]
+
+# Knobs for tuning how hard the game is (see batch_sim.py). The
+# defaults are the original game: 2-4 cars per lane at speed 2-5, cars
+# 2-3 grid cells wide, and +15 FPS (half a base speed) per crossing.
+Difficulty = namedtuple("Difficulty", "num_cars speed car_width fps_increment",
+                        defaults=((2, 4), (2, 5), (GRID_SIZE * 2, GRID_SIZE * 3), FPS_INCREMENT))
+DEFAULT_DIFFICULTY = Difficulty()
+
+# Player actions
+NOOP, UP, DOWN, LEFT, RIGHT = range(5)
+MOVES = {UP: (0, -1), DOWN: (0, 1), LEFT: (-1, 0), RIGHT: (1, 0)}
+
+# Input for one tick: a move action, whether the movement keys were
+# released (the player has to let go before moving again) and restart
+Inputs = namedtuple("Inputs", "move release restart", defaults=(NOOP, False, False))
+NO_INPUT = Inputs()
+
+
+class Player:
+    def __init__(self, world_width=WIDTH, world_height=HEIGHT):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.width = GRID_SIZE * 0.9  # Slightly smaller than grid
+        self.height = GRID_SIZE * 0.9
+        self.speed = GRID_SIZE
+        self.reset()
+
+    # Back to the start of a run (the same Player is used for every run)
+    def reset(self):
+        self.top = 0  # Moving above this goes through the portal (None: no portal)
+        self.bottom = self.world_height - GRID_SIZE * 2  # Lowest row the player may move to
+        self.reset_position()
+        self.can_move = True
+        self.wing_flap = 0  # Animation counter
+        self.head_bob = 0   # New head bobbing animation
+
+    def reset_position(self):
+        self.x = self.world_width // 2.1
+        self.y = self.world_height - GRID_SIZE * 2
+
+    def animate(self):
+        # Animation counters (head bobbing and wing flapping), once per tick
+        self.head_bob = (self.head_bob + 0.05) % 6.28
+        self.wing_flap = (self.wing_flap + 0.1) % 6.28
+
+    # Returns "portal" when the top was reached, "moved" after a
+    # normal step and None when the player may not move yet
+    def move(self, dx, dy):
+        if not self.can_move:
+            return None
+
+        new_x = self.x + dx * self.speed
+        new_y = self.y + dy * self.speed
+
+        # Boundary checking for x-axis (wrap around)
+        if new_x < 0:
+            new_x = self.world_width - self.width
+        elif new_x > self.world_width - self.width:
+            new_x = 0
+
+        # Boundary checking for y-axis (teleport through portal at top)
+        if self.top is not None and new_y < self.top:  # Reached top portal
+            self.reset_position()  # Teleport back to safe zone
+            return "portal"
+
+        # Block downward movement at safe zone bottom
+        if new_y > self.bottom:
+            new_y = self.bottom
+
+        self.x = new_x
+        self.y = new_y
+        self.can_move = False  # Player must release key before moving again
+        return "moved"
+
+
+class Car:
+    # Compact objects, there can be thousands of cars
+    __slots__ = ("x", "prev_x", "y", "width", "height", "speed", "color", "direction")
+
+    def __init__(self, x, y, width, speed, color):
+        self.reset(x, y, width, speed, color)
+
+    # Re-initialize in place, so cars can be reused instead of re-created
+    def reset(self, x, y, width, speed, color):
+        self.x = x
+        self.prev_x = x  # Position at the previous tick, for interpolation
+        self.y = y
+        self.width = width
+        self.height = GRID_SIZE - 5
+        self.speed = speed
+        self.color = color
+        self.direction = 1 if speed > 0 else -1
+
+    # Returns True when the car wrapped around to the other side
+    def move(self, world_width=WIDTH):
+        self.prev_x = self.x
+        self.x += self.speed
+        if self.speed > 0 and self.x > world_width:
+            self.x = -self.width
+            self.prev_x = self.x  # Don't interpolate across the wrap
+            return True
+        elif self.speed < 0 and self.x < -self.width:
+            self.x = world_width
+            self.prev_x = self.x
+            return True
+        return False
+
+
+# Cars of finished runs, handed out again instead of creating new ones
+class CarPool:
+    def __init__(self):
+        self.free = []
+        self.created = 0
+
+    def acquire(self, x, y, width, speed, color):
+        if self.free:
+            car = self.free.pop()
+            car.reset(x, y, width, speed, color)
+            return car
+        self.created += 1
+        return Car(x, y, width, speed, color)
+
+    def release(self, cars):
+        self.free.extend(cars)
+
+
+def generate_car_color(rng):
+    return rng.choice(CAR_COLORS)
+
+
+# Rows from -5 down to the safe zone: odd rows are road, even rows grass
+def lane_rows(world_height=HEIGHT):
+    return range(-5, (world_height - GRID_SIZE * 3) // GRID_SIZE)  # Stop before safe zone
+
+
+def build_lanes(world_height=HEIGHT):
+    lanes = []
+    for i in lane_rows(world_height):
+        lane_y = i * GRID_SIZE
+        if i % 2 == 1:  # Road lanes
+            lanes.append(("road", lane_y))
+        else:  # Grass lanes
+            lanes.append(("grass", lane_y))
+
+    # Add safe zone grass lanes at bottom
+    for i in range(4):  # Add 4 safe zone rows
+        lanes.append(("safe_zone", world_height - GRID_SIZE * (4 - i)))
+    return lanes
+
+
+# Cars come from pool when one is given, and are added to the list
+# cars when one is given (to reuse it)
+def generate_cars(rng, world_width=WIDTH, world_height=HEIGHT, difficulty=DEFAULT_DIFFICULTY,
+                  pool=None, cars=None):
+    if cars is None:
+        cars = []
+    new_car = pool.acquire if pool is not None else Car
+    for i in lane_rows(world_height):
+        lane_y = i * GRID_SIZE
+        if i % 2 == 1:  # Road lanes (only create above safe zone)
+            generate_lane(rng, lane_y, cars, new_car, world_width, difficulty)
+    return cars
+
+
+# Add the cars of one road lane to cars
+def generate_lane(rng, lane_y, cars, new_car=Car, world_width=WIDTH, difficulty=DEFAULT_DIFFICULTY):
+    num_cars = rng.randint(*difficulty.num_cars)
+    direction = 1 if rng.random() > 0.5 else -1
+    speed = rng.randint(*difficulty.speed) * direction
+
+    for j in range(num_cars):
+        car_width = rng.randint(*difficulty.car_width)
+        spacing = world_width // num_cars
+        x = j * spacing + rng.randint(0, spacing//2)
+        cars.append(new_car(x, lane_y + 2, car_width, speed, generate_car_color(rng)))
+
+
+# The whole game state. step() advances it by one fixed tick.
+# car_store picks how cars are kept: "lanes" (Car objects indexed by
+# lane), "list" (Car objects, every car tested), "numpy" (struct of
+# arrays, for worlds with thousands of cars) or "auto".
+# collision: "test" checks the player against the cars every tick,
+# "predict" computes when the next contact will be (predict.py) and
+# only tests at that tick, recomputing when the player moves.
+# solvable: every car layout is checked (and repaired if needed) to
+# have a way across at top speed (levelgen.py, needs NumPy).
+class Game:
+    scrolls = False  # The view follows the player (see endless.py)
+
+    def __init__(self, seed=None, high_score=0, on_high_score=None,
+                 world_width=WIDTH, world_height=HEIGHT, car_store="lanes",
+                 difficulty=DEFAULT_DIFFICULTY, collision="test", solvable=False):
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)  # Hands out a seed per run
+        self.run_seed = None
+        self.world_width = world_width
+        self.world_height = world_height
+        # Define safe zone boundaries (3 rows at bottom)
+        self.safe_zone_top = world_height - GRID_SIZE * 3
+        self.lanes = build_lanes(world_height)
+        self.high_score = high_score
+        self.on_high_score = on_high_score  # Called with the new record
+        self.car_store = car_store
+        self.difficulty = difficulty
+        self.collision = collision
+        if solvable:
+            from levelgen import LevelChecker  # levelgen imports this module
+            self.level_checker = LevelChecker(world_width, world_height)
+        else:
+            self.level_checker = None
+        self.sim_speed_increment = difficulty.fps_increment / BASE_FPS
+        self.portal_frame = 0
+        self.tick = 0
+        self.camera_y = 0  # World y at the top of the view
+        self.moves = 0     # Moves the player made, over all runs
+        # Kept across runs: a restart reuses the player, the cars (from the
+        # pool) and the car store instead of building new ones
+        self.player = None
+        self.cars = None
+        self.car_pool = CarPool()
+        self.car_list = []
+        self.restart()
+
+    # Start a run. Every run has its own seed (the first one uses the game
+    # seed), so a run's car layout can be reproduced from run_seed alone.
+    def restart(self):
+        self.run_seed = self.seed if self.run_seed is None else self.rng.randrange(2**32)
+        run_rng = random.Random(self.run_seed)
+        if self.player is None:
+            self.player = Player(self.world_width, self.world_height)
+        else:
+            self.player.reset()
+        self.cars = self.new_cars(run_rng)
+        self.score = 0
+        self.game_over = False
+        self.sim_speed = 1.0
+        self.max_sim_speed = 1.0  # Highest speed reached this run
+        self.run_time = 0.0       # Seconds of play this run (simulation time)
+        self.crossings = 0        # Times the portal was reached this run
+        self.car_ticks = 0        # Car moves this run
+        if self.collision == "predict" and not self.scrolls:
+            # A scrolling game refills its lanes, which the predictor doesn't follow
+            self.predictor = LanePredictor(self.cars, self.world_width, GRID_SIZE)
+        else:
+            self.predictor = None
+        self.next_contact = None
+        self.contact_stale = True  # next_contact has to be computed again
+
+    def new_cars(self, rng):
+        cars = self.car_list
+        self.car_pool.release(cars)
+        del cars[:]
+        generate_cars(rng, self.world_width, self.world_height, self.difficulty, self.car_pool, cars)
+        if self.level_checker is not None:
+            from levelgen import make_solvable
+            make_solvable(cars, rng, self.level_checker, self.difficulty, self.car_pool)
+        if self.cars is not None and hasattr(self.cars, "refill"):
+            self.cars.refill(cars)
+            return self.cars
+        return make_car_store(cars, GRID_SIZE, self.car_store)
+
+    def move_player(self, dx, dy):
+        result = self.player.move(dx, dy)
+        if result is not None:
+            self.moves += 1
+            self.contact_stale = True
+        if result == "portal":
+            # Speed up, capped at 4x
+            self.sim_speed = min(self.sim_speed + self.sim_speed_increment, MAX_SIM_SPEED)
+            self.crossings += 1
+            self.max_sim_speed = max(self.max_sim_speed, self.sim_speed)
+        elif result == "moved" and dy < 0:
+            # Score increases when moving up (but not when teleporting)
+            self.score += 1
+            if self.score > self.high_score:
+                self.high_score = self.score
+                if self.on_high_score is not None:
+                    self.on_high_score(self.high_score)
+
+    # Collision detection (only outside safe zone)
+    def player_hit(self):
+        player = self.player
+        if player.y >= self.safe_zone_top:
+            return False
+        return self.cars.hits(player.x, player.y, player.width, player.height)
+
+    # player_hit(), or with a predictor only at the predicted contact
+    def check_collision(self):
+        if self.predictor is None:
+            return self.player_hit()
+        player = self.player
+        if self.contact_stale:
+            self.contact_stale = False
+            if player.y >= self.safe_zone_top:
+                self.next_contact = None
+            else:
+                self.next_contact = self.predictor.next_hit(player.x, player.y, player.width,
+                                                            player.height, self.car_ticks)
+        if self.next_contact is None or self.car_ticks < self.next_contact:
+            return False
+        if self.player_hit():
+            return True
+        self.contact_stale = True  # Not a contact after all, predict again next tick
+        return False
+
+    def step(self, inputs=NO_INPUT):
+        if inputs.restart and self.game_over:
+            self.restart()
+        if inputs.release:
+            self.player.can_move = True
+
+        if not self.game_over:
+            self.run_time += 1 / (BASE_FPS * self.sim_speed)
+            if inputs.move != NOOP:
+                self.move_player(*MOVES[inputs.move])
+
+            # Move cars
+            self.cars.move(self.world_width)
+            self.car_ticks += 1
+            if self.check_collision():
+                self.game_over = True
+        else:
+            # Cars stand still, nothing to interpolate
+            self.cars.freeze()
+
+        # Animations run on the simulation clock as well
+        self.player.animate()
+        self.portal_frame = (self.portal_frame + PORTAL_STEP) % PORTAL_CYCLE
+        self.tick += 1
@@ -0,0 +1,195 @@
+import pygame
+from pygame._sdl2.video import Window, Renderer as SdlRenderer, Texture
+from game_core import GRID_SIZE, BASE_FPS, PORTAL_CYCLE, PORTAL_STEP
+from sprites import ChickenSprites, CarAtlas, PortalFrames
+from hud import get_font, CachedText
+from profiler import ProfilerOverlay
+from renderer import WHITE, BLACK, CHICKEN_COLORS, PORTAL_Y, PORTAL_HEIGHT, draw_lanes, draw_portal, no_lap
+
+# Drawing with SDL's 2D renderer (pygame._sdl2.video) instead of onto
+# the display surface: the pre-rendered sprites of renderer.Renderer
+# (lanes, portal frames, cars, chicken frames, HUD text) are uploaded
+# once as textures and every frame is a list of textured quads the
+# GPU draws. Same draw(game, alpha) as renderer.Renderer, which stays
+# the fallback when no SDL renderer can be made (see "Urho - PU.py").
+#
+# Headless (tests, benchmarks) it runs on SDL's software renderer:
+#   SDL_VIDEODRIVER=dummy SDL_RENDER_DRIVER=software
+
+MAX_TEXTURE_HEIGHT = 4096  # Tall sheets are split in pages of this height (safe on any GPU)
+
+
+# An SDL window with a renderer, drawing game_core.Game like Renderer
+class GpuRenderer:
+    def __init__(self, window, game, chicken_phase_steps=None, chicken_cache_bytes=4 * 1024 * 1024,
+                 profiler=None, portal_frames=None, vsync=False):
+        self.window = window
+        self.renderer = SdlRenderer(window, vsync=vsync)
+        self.width, self.height = window.size
+        self.profiler = profiler
+        self.profiler_overlay = ProfilerOverlay(profiler) if profiler is not None else None
+        self.overlay_surface = None  # Window-sized, for the overlay panel
+        self.overlay_texture = None  # Streaming, the panel is updated into it every frame
+
+        self.chicken_sprites = ChickenSprites(game.player.width, game.player.height, CHICKEN_COLORS,
+                                              chicken_phase_steps, chicken_cache_bytes)
+        self.chicken_textures = {}  # Frame key -> texture
+        self.car_atlas = CarAtlas(GRID_SIZE - 5)
+        self.car_textures = {}      # Atlas key -> texture
+
+        self.portal_rect = pygame.Rect(0, PORTAL_Y - 10, self.width, PORTAL_HEIGHT + 20).clip(
+            pygame.Rect(0, 0, self.width, self.height))
+        self.portal_frames_count = portal_frames
+        self.build_background(game.lanes)
+
+        hud_font = get_font('Arial', 28, bold=True)
+        self.score_label = CachedText(hud_font, "Score: {}")
+        self.high_score_label = CachedText(hud_font, "High Score: {}")
+        self.fps_label = CachedText(hud_font, "Speed: {}")
+        self.game_over_text = self.texture(hud_font.render("GAME OVER! Press R to restart", True, WHITE))
+        self.label_textures = {}  # Label -> (surface, texture), re-uploaded when the text changes
+
+    def texture(self, surface):
+        return Texture.from_surface(self.renderer, surface)
+
+    def build_background(self, lanes):
+        self.lanes = lanes
+        background = pygame.Surface((self.width, self.height))
+        background.fill(BLACK)
+        draw_lanes(background, lanes, self.width, self.height)
+        self.background = self.texture(background)
+
+        # Portal frames with the lanes on top, as in Renderer, uploaded in
+        # pages of whole frames
+        lane_layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        draw_lanes(lane_layer, lanes, self.width, self.height)
+        overlay = lane_layer.subsurface(self.portal_rect).copy()
+        self.portal = PortalFrames(self.portal_rect, self.draw_portal, PORTAL_CYCLE, PORTAL_STEP,
+                                   overlay, BLACK, self.portal_frames_count)
+        self.portal.prerender()
+        frame_height = self.portal_rect.height
+        self.frames_per_page = max(1, MAX_TEXTURE_HEIGHT // max(frame_height, 1))
+        self.portal_pages = []
+        sheet = self.portal.sheet
+        for first in range(0, self.portal.frames, self.frames_per_page):
+            count = min(self.frames_per_page, self.portal.frames - first)
+            page = sheet.subsurface((0, first * frame_height, self.width, count * frame_height))
+            self.portal_pages.append(self.texture(page))
+        self.portal.sheet = self.portal.views = None  # Only the textures are used from here on
+
+        self.lane_tiles = {}
+        for lane_type in ("grass", "road", "safe_zone"):
+            tile = pygame.Surface((self.width, GRID_SIZE))
+            draw_lanes(tile, [(lane_type, 0)], self.width, GRID_SIZE)
+            self.lane_tiles[lane_type] = self.texture(tile)
+
+    def draw_portal(self, surface, portal_frame):
+        draw_portal(surface, portal_frame, self.width)
+
+    def draw_background(self, game):
+        self.background.draw(dstrect=(0, 0))
+        if self.portal_rect.height:
+            index = self.portal.index(game.portal_frame)
+            page = self.portal_pages[index // self.frames_per_page]
+            height = self.portal_rect.height
+            source = (0, (index % self.frames_per_page) * height, self.width, height)
+            page.draw(srcrect=source, dstrect=self.portal_rect)
+
+    def draw_scrolling_background(self, game):
+        for lane_type, y in game.lanes:
+            y -= game.camera_y
+            if -GRID_SIZE < y < self.height:
+                self.lane_tiles[lane_type].draw(dstrect=(0, int(y)))
+
+    def draw_cars(self, cars, alpha, camera_y=0):
+        atlas = self.car_atlas
+        textures = self.car_textures
+        for car in cars:
+            y = car.y - camera_y
+            if -car.height <= y <= self.height:
+                key = (car.color, car.width, car.direction)
+                texture = textures.get(key)
+                if texture is None:
+                    texture = textures[key] = self.texture(atlas.get(*key))
+                else:
+                    atlas.hits += 1  # Keeps CarAtlas.stats() meaningful
+                x = car.prev_x + (car.x - car.prev_x) * alpha
+                texture.draw(dstrect=(int(x) - atlas.PAD_LEFT, int(y)))
+
+    def draw_player(self, player, camera_y=0):
+        sprites = self.chicken_sprites
+        key = sprites.frame_key(player.head_bob, player.wing_flap)
+        texture = self.chicken_textures.get(key)
+        if texture is None:
+            texture = self.chicken_textures[key] = self.texture(sprites.get(player.head_bob, player.wing_flap))
+        texture.draw(dstrect=(int(player.x - sprites.pad), int(player.y - camera_y - sprites.pad)))
+
+    def label(self, label, value, color):
+        surface = label.render(value, color)
+        uploaded = self.label_textures.get(label)
+        if uploaded is None or uploaded[0] is not surface:
+            uploaded = self.label_textures[label] = (surface, self.texture(surface))
+        return uploaded[1]
+
+    def draw_hud(self, game):
+        score = self.label(self.score_label, game.score, WHITE)
+        score.draw(dstrect=(10, 10))
+        high_score = self.label(self.high_score_label, game.high_score, WHITE)
+        high_score.draw(dstrect=(self.width - high_score.width - 10, 10))
+        fps_color = WHITE if game.sim_speed < 3 else (255, 100, 100)
+        fps = self.label(self.fps_label, round(BASE_FPS * game.sim_speed), fps_color)
+        fps.draw(dstrect=(self.width // 2 - fps.width // 2, 10))
+        if game.game_over:
+            self.game_over_text.draw(dstrect=(self.width//2 - 150, self.height//2))
+
+    # The overlay changes every frame: its panel is copied into the same
+    # streaming texture each time instead of making a new texture
+    def draw_profiler_overlay(self):
+        if self.overlay_surface is None:
+            self.overlay_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            self.overlay_texture = Texture(self.renderer, (self.width, self.height), streaming=True)
+            self.overlay_texture.blend_mode = pygame.BLENDMODE_BLEND
+        self.overlay_surface.fill((0, 0, 0, 0))
+        rect = self.profiler_overlay.draw(self.overlay_surface)
+        if rect.width and rect.height:
+            self.overlay_texture.update(self.overlay_surface.subsurface(rect), area=rect)
+            self.overlay_texture.draw(srcrect=rect, dstrect=rect)
+
+    def draw(self, game, alpha=1.0):
+        lap = self.profiler.lap if self.profiler is not None else no_lap
+        renderer = self.renderer
+        renderer.draw_color = BLACK + (255,)
+        renderer.clear()
+        if game.scrolls:
+            self.draw_scrolling_background(game)
+        else:
+            if game.lanes is not self.lanes:
+                self.build_background(game.lanes)
+            self.draw_background(game)
+        lap("background")
+        self.draw_cars(game.cars, alpha, game.camera_y)
+        lap("cars")
+        self.draw_player(game.player, game.camera_y)
+        lap("player")
+        self.draw_hud(game)
+        lap("hud")
+        if self.profiler_overlay is not None and self.profiler_overlay.visible:
+            self.draw_profiler_overlay()
+            lap("overlay")
+        renderer.present()
+        lap("present")
+
+    # The last frame drawn, as a Surface (for tests and screenshots)
+    def to_surface(self):
+        return self.renderer.to_surface()
+
+
+# Window plus GpuRenderer; raises pygame.error when SDL can't make a
+# renderer (the caller falls back to renderer.Renderer)
+def open_gpu_renderer(title, size, game, *args, **kwargs):
+    window = Window(title, size)
+    try:
+        return GpuRenderer(window, game, *args, **kwargs)
+    except pygame.error:
+        window.destroy()
+        raise
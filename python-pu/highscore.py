@@ -0,0 +1,96 @@
+import os
+import tempfile
+import threading
+
+HIGH_SCORE_FILE = "highscore.txt"
+
+
+# Load high score from file if it exists
+def load_high_score(path=HIGH_SCORE_FILE):
+    try:
+        with open(path, "r") as file:
+            return int(file.read())
+    except FileNotFoundError:
+        return 0
+    except (ValueError, UnicodeDecodeError):  # Corrupt file
+        return 0
+    except OSError as error:  # Unreadable, e.g. a directory
+        print("Can't read the high score, starting from 0:", error)
+        return 0
+
+
+# Save high score to file. The score is written to a temporary file next
+# to it and renamed over it, so a crash never leaves a half written file.
+def save_high_score(score, path=HIGH_SCORE_FILE):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".highscore-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as file:
+            file.write(str(score))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+# Write-behind high score persistence. submit() only remembers the score;
+# a background thread writes the newest one every `interval` seconds,
+# or right away after flush_soon() (game over). close() (quit) stops the
+# thread and writes whatever is still pending; a failed write is reported,
+# not raised, so the rest of shutdown still runs.
+class HighScoreWriter:
+    def __init__(self, path=HIGH_SCORE_FILE, interval=2.0):
+        self.path = path
+        self.interval = interval
+        self.pending = None
+        self.lock = threading.Lock()        # Guards pending
+        self.write_lock = threading.Lock()  # One writer at a time
+        self.wake = threading.Event()
+        self.stopped = False
+        self.writes = 0
+        self.thread = threading.Thread(target=self.run, name="highscore-writer", daemon=True)
+        self.thread.start()
+
+    # Called from the game thread, never blocks on the disk
+    def submit(self, score):
+        with self.lock:
+            if self.pending is None or score > self.pending:
+                self.pending = score
+
+    def flush_soon(self):
+        self.wake.set()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                score = self.pending
+                self.pending = None
+            if score is None:
+                return
+            try:
+                save_high_score(score, self.path)
+                self.writes += 1
+            except OSError:
+                # Keep the score for the next attempt unless a newer one came in
+                self.submit(score)
+                raise
+
+    def run(self):
+        while not self.stopped:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except OSError:
+                pass  # Try again on the next round
+
+    def close(self):
+        self.stopped = True
+        self.wake.set()
+        self.thread.join()
+        try:
+            self.flush()
+        except OSError as error:  # Quitting goes on without it
+            print("Can't save the high score:", error)
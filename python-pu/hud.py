@@ -0,0 +1,81 @@
+import pygame
+import sys
+import tracemalloc
+
+# Fonts are expensive to create, keep one per (name, size, bold, italic)
+_fonts = {}
+
+def get_font(name, size, bold=False, italic=False):
+    key = (name, size, bold, italic)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(name, size, bold, italic)
+        _fonts[key] = font
+    return font
+
+
+# A HUD label that only re-renders its surface when the value or
+# color changes. The format string is only applied on a change too.
+class CachedText:
+    def __init__(self, font, template="{}", antialias=True):
+        self.font = font
+        self.template = template
+        self.antialias = antialias
+        self.value = None
+        self.color = None
+        self.surface = None
+
+    def render(self, value, color):
+        if self.surface is None or value != self.value or color != self.color:
+            self.surface = self.font.render(self.template.format(value), self.antialias, color)
+            self.value = value
+            self.color = color
+        return self.surface
+
+
+# Counts what the game loop allocates per frame. Uses tracemalloc, so
+# it is only switched on when asked for (it slows the game down):
+#   peak  = most bytes allocated at once during the frame (temporary
+#           Surfaces, Fonts, Rects, strings all show up here)
+#   blocks = memory blocks still allocated at the end of the frame
+class FrameAllocations:
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.frames = 0
+        self.total_peak = 0
+        self.max_peak = 0
+        self.total_blocks = 0
+        self.start_bytes = 0
+        self.start_blocks = 0
+        self.last_peak = 0
+        self.last_blocks = 0
+        if enabled:
+            tracemalloc.start()
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        tracemalloc.reset_peak()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.start_blocks = sys.getallocatedblocks()
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        peak = tracemalloc.get_traced_memory()[1] - self.start_bytes
+        blocks = sys.getallocatedblocks() - self.start_blocks
+        self.last_peak = peak
+        self.last_blocks = blocks
+        self.frames += 1
+        self.total_peak += peak
+        self.total_blocks += blocks
+        self.max_peak = max(self.max_peak, peak)
+
+    def summary(self):
+        frames = max(self.frames, 1)
+        return {
+            "frames": self.frames,
+            "avg_peak_bytes": self.total_peak / frames,
+            "max_peak_bytes": self.max_peak,
+            "avg_net_blocks": self.total_blocks / frames,
+        }
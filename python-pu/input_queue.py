@@ -0,0 +1,129 @@
+import time
+from collections import deque
+import pygame
+from game_core import Inputs, NOOP
+
+# Movement input for the game loop, in two flavors with the same
+# interface:
+#   InputQueue  every KEYDOWN of a movement key is stamped when the loop
+#               reads it and queued; each simulation tick takes the
+#               oldest one. A tap that goes down and up between two
+#               frames still moves, and two quick taps move twice.
+#   PolledInput the original way: pygame.key.get_pressed() once per
+#               frame, moving again only after the key was released.
+# Both measure the input latency: from the moment a KEYDOWN was read to
+# the end of the frame that first shows the move (after the display
+# update). Samples go to FrameProfiler.add_latency.
+
+MAX_QUEUED_MOVES = 8  # Presses beyond this are dropped (counted in dropped)
+
+
+class InputLatency:
+    def __init__(self, profiler=None):
+        self.profiler = profiler
+        self.presses = deque()  # Read times of presses not applied yet
+        self.applied = []       # Read times of presses applied, not shown yet
+        self.lost = 0           # Presses that never moved the player
+
+    def pressed(self, read_time):
+        self.presses.append(read_time)
+
+    # A tick moved the player (Game.moves went up): the oldest waiting
+    # press caused it
+    def moved(self):
+        if self.presses:
+            self.applied.append(self.presses.popleft())
+
+    # The frame with the applied moves is on the screen
+    def presented(self, now=None):
+        if not self.applied:
+            return
+        if now is None:
+            now = time.perf_counter()
+        if self.profiler is not None:
+            for read_time in self.applied:
+                self.profiler.add_latency(now - read_time)
+        del self.applied[:]
+
+    # Presses that can't move the player anymore (game over)
+    def forget(self):
+        self.lost += len(self.presses)
+        self.presses.clear()
+
+
+class InputQueue(InputLatency):
+    def __init__(self, move_keys, profiler=None, max_moves=MAX_QUEUED_MOVES):
+        super().__init__(profiler)
+        self.move_keys = dict(move_keys)
+        self.moves = deque()  # Actions in press order
+        self.max_moves = max_moves
+        self.dropped = 0
+
+    def key_down(self, key, read_time):
+        action = self.move_keys.get(key)
+        if action is None:
+            return
+        if len(self.moves) >= self.max_moves:
+            self.dropped += 1
+            self.lost += 1
+            return
+        self.moves.append(action)
+        self.pressed(read_time)
+
+    def key_up(self, key):
+        pass
+
+    def poll(self, game):
+        if game.game_over:
+            self.clear()
+
+    def clear(self):
+        self.moves.clear()
+        self.forget()
+
+    # Inputs for the next tick: one queued press, as a tap (released in
+    # the same tick, so the next press can move again)
+    def next_input(self, restart=False):
+        if self.moves:
+            return Inputs(self.moves.popleft(), True, restart)
+        return Inputs(restart=restart)
+
+
+class PolledInput(InputLatency):
+    def __init__(self, move_keys, profiler=None):
+        super().__init__(profiler)
+        self.move_keys = list(move_keys)
+        self.keys = {key for key, _ in self.move_keys}
+        self.move = NOOP
+        self.release = False
+
+    def key_down(self, key, read_time):
+        if key in self.keys:
+            self.pressed(read_time)
+
+    # Reset movement flag when key is released
+    def key_up(self, key):
+        if key in self.keys:
+            self.release = True
+
+    # Handle player movement (only on key press, not hold), applied at
+    # the next simulation tick
+    def poll(self, game, pressed=None):
+        if game.game_over:
+            self.forget()
+            return
+        if pressed is None:
+            pressed = pygame.key.get_pressed()
+        for key, action in self.move_keys:
+            if pressed[key]:
+                self.move = action
+                return
+        if self.move == NOOP:
+            # Taps that went down and up since the last poll are not seen
+            self.forget()
+
+    def next_input(self, restart=False):
+        inputs = Inputs(self.move, self.release, restart)
+        self.move = NOOP
+        self.release = False
+        return inputs
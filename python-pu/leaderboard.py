@@ -0,0 +1,153 @@
+import os
+import sqlite3
+import threading
+import time
+from highscore import HIGH_SCORE_FILE, load_high_score
+
+LEADERBOARD_FILE = "leaderboard.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    max_speed INTEGER,          -- highest speed reached (the HUD value, 30..120)
+    duration REAL,              -- seconds of play
+    seed INTEGER,               -- game_core run seed, reproduces the car layout
+    finished_at REAL NOT NULL,  -- unix time
+    day INTEGER NOT NULL        -- local date as YYYYMMDD, for per-day queries
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC);
+CREATE INDEX IF NOT EXISTS runs_by_time ON runs (finished_at);
+CREATE INDEX IF NOT EXISTS runs_by_day ON runs (day, score DESC);
+
+-- Number of runs per score, keeps rank() independent of the number of runs
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    runs INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def day_of(timestamp):
+    t = time.localtime(timestamp)
+    return t.tm_year * 10000 + t.tm_mon * 100 + t.tm_mday
+
+
+def connect(path, **kwargs):
+    db = sqlite3.connect(path, **kwargs)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+def insert_runs(db, rows):
+    db.executemany("INSERT INTO runs (score, max_speed, duration, seed, finished_at, day) "
+                   "VALUES (?, ?, ?, ?, ?, ?)", rows)
+    db.executemany("INSERT INTO score_counts VALUES (?, 1) "
+                   "ON CONFLICT (score) DO UPDATE SET runs = runs + 1",
+                   [(row[0],) for row in rows])
+
+
+# Local leaderboard with the history of every finished run, next to the
+# single number in highscore.txt. record_run() only queues the run; like
+# highscore.HighScoreWriter, a background thread inserts the queue right
+# away (game over) or every `interval` seconds after a failed write, on
+# its own connection. top() and rank() are index lookups, so they stay
+# fast with millions of stored runs.
+class Leaderboard:
+    def __init__(self, path=LEADERBOARD_FILE, interval=5.0, legacy_path=HIGH_SCORE_FILE):
+        self.path = path
+        self.interval = interval
+        self.pending = []
+        self.lock = threading.Lock()        # Guards pending
+        self.write_lock = threading.Lock()  # Guards writer_db
+        self.wake = threading.Event()
+        self.stopped = False
+        self.db = connect(path)
+        self.db.executescript(SCHEMA)
+        self.import_legacy(legacy_path)
+        self.writer_db = connect(path, check_same_thread=False)
+        self.thread = threading.Thread(target=self.run, name="leaderboard-writer", daemon=True)
+        self.thread.start()
+
+    # Bring the record from highscore.txt over on first run
+    def import_legacy(self, legacy_path):
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+            return
+        score = load_high_score(legacy_path) if legacy_path else 0
+        with self.db:
+            if score > 0:
+                finished_at = os.path.getmtime(legacy_path)
+                insert_runs(self.db, [(score, None, None, None, finished_at, day_of(finished_at))])
+            self.db.execute("INSERT INTO meta VALUES ('legacy_imported', ?)", (str(score),))
+
+    # Called from the game thread at game over, never blocks on the disk
+    def record_run(self, score, max_speed, duration, seed, finished_at=None):
+        if finished_at is None:
+            finished_at = time.time()
+        with self.lock:
+            self.pending.append((score, max_speed, duration, seed, finished_at, day_of(finished_at)))
+        self.wake.set()
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                rows = self.pending
+                self.pending = []
+            if not rows:
+                return
+            try:
+                with self.writer_db:
+                    insert_runs(self.writer_db, rows)
+            except sqlite3.Error:
+                # Keep the runs, in order, for the next attempt
+                with self.lock:
+                    self.pending[:0] = rows
+                raise
+
+    def run(self):
+        while not self.stopped:
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass  # Try again on the next round
+
+    def high_score(self):
+        row = self.db.execute("SELECT MAX(score) FROM runs").fetchone()
+        return row[0] or 0
+
+    # Best runs, optionally only those of one day (YYYYMMDD)
+    def top(self, n=10, day=None):
+        columns = "score, max_speed, duration, seed, finished_at"
+        if day is None:
+            return self.db.execute(f"SELECT {columns} FROM runs ORDER BY score DESC LIMIT ?",
+                                   (n,)).fetchall()
+        return self.db.execute(f"SELECT {columns} FROM runs WHERE day = ? ORDER BY score DESC LIMIT ?",
+                               (day, n)).fetchall()
+
+    # Position a score would have on the leaderboard (1 = best)
+    def rank(self, score):
+        row = self.db.execute("SELECT SUM(runs) FROM score_counts WHERE score > ?", (score,)).fetchone()
+        return (row[0] or 0) + 1
+
+    def run_count(self):
+        row = self.db.execute("SELECT SUM(runs) FROM score_counts").fetchone()
+        return row[0] or 0
+
+    def close(self):
+        self.stopped = True
+        self.wake.set()
+        self.thread.join()
+        try:
+            self.flush()
+        except sqlite3.Error as error:  # Quitting goes on without them
+            print("Can't save", len(self.pending), "leaderboard runs:", error)
+        self.writer_db.close()
+        self.db.close()
@@ -0,0 +1,133 @@
+import random
+from game_core import MOVES, NOOP, UP, NO_INPUT
+from car_store import overlaps
+
+# Game rules of "import pygame.py" without pygame, like game_core.py is
+# for "Urho - PU.py": a Game is stepped once per frame with the
+# game_core.Inputs of that frame. The script only reads the keyboard
+# and draws.
+
+# Constants
+WIDTH, HEIGHT = 400, 600
+GRID_SIZE = 40
+SAFE_AREA_HEIGHT = GRID_SIZE * 3  # Grass area at the top
+CAR_COLORS = [(200, 0, 0), (0, 0, 200), (0, 200, 0), (100, 100, 100)]  # Darker colors
+CAR_SPEEDS = [-3, -2, 2, 3]
+
+
+# Player (chicken)
+class Player:
+    def __init__(self, world_width=WIDTH, world_height=HEIGHT):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.reset()
+
+    def reset(self):
+        self.x = self.world_width // 2
+        self.y = self.world_height - GRID_SIZE * 2
+        self.width = GRID_SIZE
+        self.height = GRID_SIZE
+        self.speed = GRID_SIZE
+
+    def move(self, dx, dy):
+        new_x = self.x + dx * self.speed
+        new_y = self.y + dy * self.speed
+
+        # Boundary checking
+        if 0 <= new_x <= self.world_width - self.width:
+            self.x = new_x
+        if 0 <= new_y <= self.world_height - self.height:
+            self.y = new_y
+
+
+class Car:
+    def __init__(self, y, speed, rng=random, world_width=WIDTH):
+        self.world_width = world_width
+        self.reset(y, speed, rng)
+
+    # New width, color and start position, reusing this object
+    def reset(self, y, speed, rng=random):
+        self.width = rng.randint(GRID_SIZE * 2, GRID_SIZE * 3)
+        self.height = GRID_SIZE
+        self.x = -self.width if speed > 0 else self.world_width
+        self.y = y
+        self.speed = speed
+        self.color = rng.choice(CAR_COLORS)
+
+    def move(self):
+        self.x += self.speed
+        if self.speed > 0 and self.x > self.world_width:
+            self.x = -self.width
+        elif self.speed < 0 and self.x < -self.width:
+            self.x = self.world_width
+
+
+class Game:
+    def __init__(self, seed=None, world_width=WIDTH, world_height=HEIGHT):
+        self.rng = random.Random(seed)
+        self.world_width = world_width
+        self.world_height = world_height
+        self.player = Player(world_width, world_height)
+        self.cars = []
+        self.car_pool = []  # Cars of earlier games, reused by reset
+        self.score = 0
+        self.game_over = False
+        self.reset()
+
+    def new_car(self, y, speed):
+        if self.car_pool:
+            car = self.car_pool.pop()
+            car.reset(y, speed, self.rng)
+            return car
+        return Car(y, speed, self.rng, self.world_width)
+
+    def reset(self):
+        self.player.reset()
+        self.score = 0
+        self.game_over = False
+        # Recreate lanes of cars (same list, cars from the pool)
+        cars = self.cars
+        self.car_pool.extend(cars)
+        cars.clear()
+        for i in range(5):
+            lane_y = self.world_height - GRID_SIZE * (4 + i * 2)
+            speed = self.rng.choice(CAR_SPEEDS)
+            cars.append(self.new_car(lane_y, speed))
+            if self.rng.random() > 0.5:
+                cars.append(self.new_car(lane_y, speed))
+
+    # A key press moves the player right away, also after game over
+    def press(self, move):
+        player = self.player
+        player.move(*MOVES[move])
+        if move == UP and player.y < self.world_height - GRID_SIZE * 6:
+            self.score += 1
+
+    def check_collision(self):
+        player = self.player
+        for car in self.cars:
+            if overlaps(car, player.x, player.y, player.width, player.height):
+                return True
+        return False
+
+    # Cars, safe area and collisions, once per frame after the key presses
+    def update(self):
+        if self.game_over:
+            return
+        for car in self.cars:
+            car.move()
+
+        # Check if player reached the safe area
+        if self.player.y < SAFE_AREA_HEIGHT:
+            self.score += 10
+            self.player.y = self.world_height - GRID_SIZE * 2  # Reset position
+
+        if self.check_collision():
+            self.game_over = True
+
+    def step(self, inputs=NO_INPUT):
+        if inputs.restart and self.game_over:
+            self.reset()
+        if inputs.move != NOOP:
+            self.press(inputs.move)
+        self.update()
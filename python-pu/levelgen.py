@@ -0,0 +1,256 @@
+import math
+from game_core import (Player, GRID_SIZE, WIDTH, HEIGHT, BASE_FPS, MAX_SIM_SPEED, DEFAULT_DIFFICULTY,
+                       NOOP, UP, DOWN, LEFT, RIGHT, Car, generate_cars, generate_lane)
+from predict import CarMotion
+
+try:
+    import numpy as np
+except ImportError:  # Only Game(solvable=True) needs it
+    np = None
+
+# Checks that a car layout can be crossed, and repairs it when not.
+#
+# The search runs on a time-expanded grid: (row, player x, decision
+# step). A player gets one move per move_interval ticks (a person
+# presses keys only so fast, and at higher speeds more ticks pass in
+# between), so time advances in steps of move_interval ticks. For each
+# road lane, which player positions a car touches during each step is
+# worked out in closed form from the car motions (predict.CarMotion)
+# and kept as a (steps, positions) boolean table, memoized per lane by
+# its cars. The search keeps the reachable positions of all rows as the
+# bits of one int and advances them a step at a time (a few shifts and
+# a mask of that step's blocked bits) until the top row is reached
+# (solvable) or nothing is left (not). A check takes a few milliseconds.
+
+HUMAN_MOVES_PER_SECOND = 6  # Key presses a player manages per second
+HORIZON_STEPS = 300         # Decision steps searched before giving up
+
+
+# Ticks between two moves of a player at the given simulation speed
+def move_interval(sim_speed=MAX_SIM_SPEED, moves_per_second=HUMAN_MOVES_PER_SECOND):
+    return max(1, math.ceil(BASE_FPS * sim_speed / moves_per_second))
+
+
+# The player x positions that moving left and right can reach (with
+# Player.move's wrap around) and where each move leads. A set of
+# positions on the grid is an int with bit row * count + column set.
+class PlayerColumns:
+    def __init__(self, world_width=WIDTH, world_height=HEIGHT):
+        player = Player(world_width, world_height)
+        self.width = player.width
+        self.start_x = player.x
+        self.start_row = int(player.y // GRID_SIZE)
+        self.rows = int(player.bottom // GRID_SIZE) + 1  # Rows 0 (top) to the lowest the player may go
+
+        def step(x, dx):
+            new_x = x + dx * player.speed
+            if new_x < 0:
+                return world_width - player.width
+            if new_x > world_width - player.width:
+                return 0
+            return new_x
+
+        seen = {self.start_x}
+        todo = [self.start_x]
+        while todo:
+            x = todo.pop()
+            for dx in (-1, 1):
+                new_x = step(x, dx)
+                if new_x not in seen:
+                    seen.add(new_x)
+                    todo.append(new_x)
+        self.x = np.array(sorted(seen), dtype=np.float64)
+        self.count = count = len(self.x)
+        index = {x: i for i, x in enumerate(self.x.tolist())}
+        self.start = index[self.start_x]
+        self.left = [index[step(x, -1)] for x in self.x.tolist()]
+        self.right = [index[step(x, 1)] for x in self.x.tolist()]
+
+        # Mostly a move goes the same number of columns, so a move of
+        # all positions is a few shifts of the columns with that offset
+        self.all = (1 << (count * self.rows)) - 1
+        self.shifts = []
+        for targets in (self.left, self.right):
+            offsets = {}
+            for column, target in enumerate(targets):
+                offsets[target - column] = offsets.get(target - column, 0) | (1 << column)
+            for offset, row_mask in sorted(offsets.items()):
+                mask = sum(row_mask << (row * count) for row in range(self.rows))
+                self.shifts.append((offset, mask))
+        self.top_row = (1 << count) - 1
+
+    def bit(self, row, column):
+        return 1 << (row * self.count + column)
+
+    # All positions one move (or none) away from the positions in reach
+    def spread(self, reach):
+        count = self.count
+        moved = reach | (reach >> count) | ((reach << count) & self.all)
+        for offset, mask in self.shifts:
+            if offset > 0:
+                moved |= (reach & mask) << offset
+            else:
+                moved |= (reach & mask) >> -offset
+        return moved
+
+
+# Which positions a lane's cars touch during each step, as a (steps,
+# positions) boolean table. A car is in the step's range of x from its
+# first to its last move of the step (two ranges when it wraps between).
+def lane_blocked(cars, columns, world_width, interval, steps):
+    motions = [CarMotion(car, world_width) for car in cars]
+    last_tick = steps * interval
+    x = np.array([[motion.x] for motion in motions], dtype=np.float64)
+    width = np.array([[motion.width] for motion in motions], dtype=np.float64)
+    speed = np.array([[motion.speed] for motion in motions], dtype=np.float64)
+    start = np.array([[motion.start] for motion in motions], dtype=np.float64)
+    # Cars that stand still never wrap
+    first_wrap = np.array([[motion.first_wrap or last_tick + 1] for motion in motions])
+    period = np.array([[motion.period or 1] for motion in motions])
+
+    def x_at(tick):
+        return np.where(tick < first_wrap, x + speed * tick,
+                        start + speed * ((tick - first_wrap) % period))
+
+    def cycle(tick):
+        return np.where(tick < first_wrap, -1, (tick - first_wrap) // period)
+
+    first = np.arange(steps)[None, :] * interval + 1
+    last = first + interval - 1
+    x1 = x_at(first)
+    x2 = x_at(last)
+    wraps = cycle(first) != cycle(last)
+    wrap_tick = first_wrap + (cycle(first) + 1) * period
+    before_wrap = np.where(wraps, x_at(wrap_tick - 1), x2)
+    after_wrap = np.where(wraps, start, x1)
+    low = np.concatenate([np.minimum(x1, before_wrap), np.minimum(after_wrap, x2)])
+    high = np.concatenate([np.maximum(x1, before_wrap), np.maximum(after_wrap, x2)]) + np.concatenate([width, width])
+
+    # Positions x with low - player width < x < high are touched; count
+    # range starts and ends per step and add up along the positions
+    count = columns.count
+    begin = np.searchsorted(columns.x, low - columns.width, side="right")
+    end = np.searchsorted(columns.x, high, side="left")
+    row = np.broadcast_to(np.arange(steps) * (count + 1), begin.shape)
+    used = begin < end
+    edges = (np.bincount((row + begin)[used], minlength=steps * (count + 1)) -
+             np.bincount((row + end)[used], minlength=steps * (count + 1)))
+    return np.cumsum(edges.reshape(steps, count + 1), axis=1)[:, :count] > 0
+
+
+class LevelChecker:
+    def __init__(self, world_width=WIDTH, world_height=HEIGHT, sim_speed=MAX_SIM_SPEED,
+                 horizon_steps=HORIZON_STEPS):
+        if np is None:
+            raise RuntimeError("Solvable layouts need NumPy, install it or play without --solvable")
+        self.world_width = world_width
+        self.world_height = world_height
+        self.columns = PlayerColumns(world_width, world_height)
+        self.rows = self.columns.rows
+        self.interval = move_interval(sim_speed)
+        self.steps = horizon_steps
+        self.cache = {}  # Lane cars -> blocked table
+
+    def blocked(self, lane_cars):
+        key = tuple((car.x, car.width, car.speed) for car in lane_cars)
+        table = self.cache.get(key)
+        if table is None:
+            if len(self.cache) > 4096:
+                self.cache.clear()
+            table = lane_blocked(lane_cars, self.columns, self.world_width, self.interval, self.steps)
+            self.cache[key] = table
+        return table
+
+    def lanes(self, cars):
+        lanes = {}
+        for car in cars:
+            row = int(car.y // GRID_SIZE)
+            if 0 <= row < self.rows:
+                lanes.setdefault(row, []).append(car)
+        return lanes
+
+    # The blocked positions of each step, one bytes string per step
+    def blocked_steps(self, cars):
+        grid = np.zeros((self.steps, self.rows, self.columns.count), dtype=bool)
+        for row, lane_cars in self.lanes(cars).items():
+            grid[:, row] = self.blocked(lane_cars)
+        return np.packbits(grid.reshape(self.steps, -1), axis=1, bitorder="little")
+
+    # Searches for a crossing. Returns (steps to the top or None, highest
+    # row reached, reachable positions after each step)
+    def search(self, cars, keep_history=False):
+        columns = self.columns
+        blocked = self.blocked_steps(cars)
+        everything = columns.all
+        reach = columns.bit(columns.start_row, columns.start)
+        history = [reach] if keep_history else None
+        lowest_bit = reach
+        for step in range(self.steps):
+            if reach & columns.top_row:
+                return step, 0, history  # Up from the top row is the portal
+            reach = columns.spread(reach) & (everything ^ int.from_bytes(blocked[step], "little"))
+            if not reach:
+                break
+            lowest_bit = min(lowest_bit, reach & -reach)
+            if keep_history:
+                history.append(reach)
+        return None, (lowest_bit.bit_length() - 1) // columns.count, history
+
+    def solvable(self, cars):
+        return self.search(cars)[0] is not None
+
+    # Moves (one per step) that cross, ending with UP through the portal,
+    # or None. A witness for bots and level tools.
+    def find_path(self, cars):
+        steps, _, history = self.search(cars, keep_history=True)
+        if steps is None:
+            return None
+        columns = self.columns
+        row = 0
+        column = next(c for c in range(columns.count) if history[steps] & columns.bit(0, c))
+        path = [UP]
+        for step in range(steps, 0, -1):
+            before = history[step - 1]
+            moves = [(NOOP, row, column), (UP, row + 1, column), (DOWN, row - 1, column)]
+            if row == self.rows - 1:
+                moves.append((DOWN, row, column))  # Down at the lowest row stays
+            moves += [(LEFT, row, c) for c in range(columns.count) if columns.left[c] == column]
+            moves += [(RIGHT, row, c) for c in range(columns.count) if columns.right[c] == column]
+            for action, from_row, from_column in moves:
+                if 0 <= from_row < self.rows and before & columns.bit(from_row, from_column):
+                    path.append(action)
+                    row, column = from_row, from_column
+                    break
+        path.reverse()
+        return path
+
+
+# Makes sure a layout (list of cars, changed in place) can be crossed.
+# The road lane just above the highest row the search reaches gets new
+# cars, up to max_repairs times; then the whole layout is made again.
+# Returns the number of lanes regenerated and whether it is solvable.
+def make_solvable(cars, rng, checker, difficulty=DEFAULT_DIFFICULTY, pool=None,
+                  max_repairs=8, max_layouts=4):
+    new_car = pool.acquire if pool is not None else Car
+    repairs = 0
+    for _ in range(max_layouts):
+        for _ in range(max_repairs + 1):
+            steps, best_row, _ = checker.search(cars)
+            if steps is not None:
+                return repairs, True
+            row = best_row - 1 if best_row % 2 == 0 else best_row
+            lane_y = row * GRID_SIZE
+            old = [car for car in cars if car.y // GRID_SIZE == row]
+            if not old:
+                break
+            cars[:] = [car for car in cars if car.y // GRID_SIZE != row]
+            if pool is not None:
+                pool.release(old)
+            generate_lane(rng, lane_y, cars, new_car, checker.world_width, difficulty)
+            repairs += 1
+        if pool is not None:
+            pool.release(cars)
+        del cars[:]
+        generate_cars(rng, checker.world_width, checker.world_height, difficulty, pool, cars)
+        repairs += 1
+    return repairs, checker.solvable(cars)
@@ -0,0 +1,218 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Only used for lanes with many cars
+    np = None
+
+# Where cars will be, without simulating tick by tick. A car moves by
+# speed every tick and wraps at the window edges (Car.move), so its x
+# after m moves has a closed form: a straight run until the first wrap,
+# then a cycle of `period` moves starting from the edge it wraps to.
+# From that, the ticks at which a car overlaps an x range are whole
+# number intervals, one before the first wrap and one per cycle.
+#
+# Ticks here count car moves since the predictor was built (m = 0 is
+# the state it was built from, m = 1 after the next Car.move, ...).
+
+VECTOR_MIN_CARS = 32  # Lanes with this many cars are answered with NumPy
+
+
+# The motion of one car, from its current state
+class CarMotion:
+    __slots__ = ("x", "y", "width", "height", "speed", "first_wrap", "period", "start")
+
+    def __init__(self, car, world_width):
+        self.x = car.x
+        self.y = car.y
+        self.width = car.width
+        self.height = car.height
+        self.speed = speed = car.speed
+        if speed > 0:
+            # Wraps on the first move that takes it past the right edge
+            self.first_wrap = max(1, math.floor((world_width - car.x) / speed) + 1)
+            self.start = -car.width
+            self.period = math.floor((world_width + car.width) / speed) + 1
+        elif speed < 0:
+            self.first_wrap = max(1, math.floor((car.x + car.width) / -speed) + 1)
+            self.start = world_width
+            self.period = math.floor((world_width + car.width) / -speed) + 1
+        else:
+            self.first_wrap = self.period = None
+            self.start = car.x
+
+    def x_at(self, tick):
+        if self.speed == 0 or tick < self.first_wrap:
+            return self.x + self.speed * tick
+        return self.start + self.speed * ((tick - self.first_wrap) % self.period)
+
+    # Moves m with from_x + speed * m strictly between low and high
+    def steps_inside(self, from_x, low, high):
+        a = (low - from_x) / self.speed
+        b = (high - from_x) / self.speed
+        if a > b:
+            a, b = b, a
+        return math.floor(a) + 1, math.ceil(b) - 1
+
+    # First tick >= tick at which the car overlaps the x range [x, x + width)
+    def next_hit(self, x, width, tick):
+        low = x - self.width  # Overlap when low < car x < high
+        high = x + width
+        if self.speed == 0:
+            return tick if low < self.x < high else None
+        # Before the first wrap
+        if tick < self.first_wrap:
+            first, last = self.steps_inside(self.x, low, high)
+            first = max(first, tick)
+            if first <= min(last, self.first_wrap - 1):
+                return first
+        # In the cycle
+        first, last = self.steps_inside(self.start, low, high)
+        first = max(first, 0)
+        last = min(last, self.period - 1)
+        if first > last:
+            return None
+        tick = max(tick, self.first_wrap)
+        phase = (tick - self.first_wrap) % self.period
+        if phase <= last:
+            return tick + max(0, first - phase)
+        return tick + self.period - phase + first
+
+    # Half-open tick ranges [a, b) within [tick, end) with an overlap
+    def hit_ranges(self, x, width, tick, end):
+        low = x - self.width
+        high = x + width
+        if self.speed == 0:
+            if low < self.x < high:
+                yield tick, end
+            return
+        if tick < self.first_wrap:
+            first, last = self.steps_inside(self.x, low, high)
+            first = max(first, tick)
+            last = min(last, self.first_wrap - 1, end - 1)
+            if first <= last:
+                yield first, last + 1
+        first, last = self.steps_inside(self.start, low, high)
+        first = max(first, 0)
+        last = min(last, self.period - 1)
+        if first > last:
+            return
+        # Cycles that can reach into [tick, end)
+        cycle = max(0, (tick - self.first_wrap) // self.period)
+        while True:
+            base = self.first_wrap + cycle * self.period
+            if base + first >= end:
+                return
+            a = max(base + first, tick)
+            b = min(base + last + 1, end)
+            if a < b:
+                yield a, b
+            cycle += 1
+
+
+# CarMotion.next_hit for all the (moving) cars of a lane at once
+class LaneMotions:
+    def __init__(self, motions):
+        self.x = np.array([motion.x for motion in motions], dtype=np.float64)
+        self.y = np.array([motion.y for motion in motions], dtype=np.float64)
+        self.width = np.array([motion.width for motion in motions], dtype=np.float64)
+        self.height = np.array([motion.height for motion in motions], dtype=np.float64)
+        self.speed = np.array([motion.speed for motion in motions], dtype=np.float64)
+        self.first_wrap = np.array([motion.first_wrap for motion in motions], dtype=np.int64)
+        self.period = np.array([motion.period for motion in motions], dtype=np.int64)
+        self.start = np.array([motion.start for motion in motions], dtype=np.float64)
+
+    def steps_inside(self, from_x, low, high):
+        a = (low - from_x) / self.speed
+        b = (high - from_x) / self.speed
+        return np.floor(np.minimum(a, b)).astype(np.int64) + 1, np.ceil(np.maximum(a, b)).astype(np.int64) - 1
+
+    def next_hit(self, x, y, width, height, tick):
+        low = x - self.width
+        high = x + width
+        # Before the first wrap (never true once tick >= first_wrap)
+        first, last = self.steps_inside(self.x, low, high)
+        first = np.maximum(first, tick)
+        before = first <= np.minimum(last, self.first_wrap - 1)
+        # In the cycle
+        cycle_first, cycle_last = self.steps_inside(self.start, low, high)
+        cycle_first = np.maximum(cycle_first, 0)
+        cycle_last = np.minimum(cycle_last, self.period - 1)
+        now = np.maximum(tick, self.first_wrap)
+        phase = (now - self.first_wrap) % self.period
+        cycle = np.where(phase <= cycle_last, now + np.maximum(0, cycle_first - phase),
+                         now + self.period - phase + cycle_first)
+        hit = np.where(before, first, cycle)
+        valid = (before | (cycle_first <= cycle_last)) & (y < self.y + self.height) & (y + height > self.y)
+        if not valid.any():
+            return None
+        return int(hit[valid].min())
+
+
+# Cars grouped by the grid row(s) they are in, like LaneIndexedCarList.
+# Built from a car store at some moment; valid as long as the cars
+# keep moving by the rules (not after a restart).
+class LanePredictor:
+    def __init__(self, cars, world_width, grid_size):
+        self.grid_size = grid_size
+        self.lanes = {}
+        for car in cars:
+            motion = CarMotion(car, world_width)
+            for row in self.rows(car.y, car.height):
+                self.lanes.setdefault(row, []).append(motion)
+        # Busy lanes of moving cars as arrays
+        self.vector_lanes = {}
+        if np is not None:
+            for row, motions in self.lanes.items():
+                if len(motions) >= VECTOR_MIN_CARS and all(motion.speed != 0 for motion in motions):
+                    self.vector_lanes[row] = LaneMotions(motions)
+
+    def rows(self, y, height):
+        return range(int(y // self.grid_size), int((y + height - 1) // self.grid_size) + 1)
+
+    def cars_at(self, y, height):
+        for row in self.rows(y, height):
+            for motion in self.lanes.get(row, ()):
+                if y < motion.y + motion.height and y + height > motion.y:
+                    yield motion
+
+    # First tick >= tick at which a car overlaps the box, None if never
+    def next_hit(self, x, y, width, height, tick):
+        best = None
+        for row in self.rows(y, height):
+            vector_lane = self.vector_lanes.get(row)
+            if vector_lane is not None:
+                hit = vector_lane.next_hit(x, y, width, height, tick)
+                if hit is not None and (best is None or hit < best):
+                    best = hit
+                continue
+            for motion in self.lanes.get(row, ()):
+                if y < motion.y + motion.height and y + height > motion.y:
+                    hit = motion.next_hit(x, width, tick)
+                    if hit is not None and (best is None or hit < best):
+                        best = hit
+            if best == tick:
+                break
+        return best
+
+    # Ticks until the box is hit, counted from tick (0 = hit now)
+    def time_to_hit(self, x, y, width, height, tick):
+        hit = self.next_hit(x, y, width, height, tick)
+        return None if hit is None else hit - tick
+
+    # Half-open tick ranges in [tick, tick + horizon) without a car in the box
+    def safe_windows(self, x, y, width, height, tick, horizon):
+        end = tick + horizon
+        blocked = []
+        for motion in self.cars_at(y, height):
+            blocked.extend(motion.hit_ranges(x, width, tick, end))
+        blocked.sort()
+        windows = []
+        free_from = tick
+        for a, b in blocked:
+            if a > free_from:
+                windows.append((free_from, a))
+            free_from = max(free_from, b)
+        if free_from < end:
+            windows.append((free_from, end))
+        return windows
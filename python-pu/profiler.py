@@ -0,0 +1,208 @@
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from hud import get_font
+
+# Per-frame timing of the game loop phases. The loop calls lap(phase)
+# after each phase; the time since the previous lap is booked on it.
+# Cheap enough (a perf_counter_ns() per phase) to always be on; the
+# overlay (F3 in the game) shows rolling averages, a frame time graph
+# and the frame rate actually reached. Input latency samples (see
+# input_queue.py) are kept next to the frames.
+
+OVERLAY_BACKGROUND = (0, 0, 0, 170)
+OVERLAY_TEXT = (255, 255, 255)
+GRAPH_OK = (100, 220, 100)
+GRAPH_SLOW = (255, 100, 100)
+GRAPH_BUDGET = (255, 220, 0)
+WAIT_PHASE = "wait"  # Time spent sleeping in clock.tick(), not work
+
+
+class FrameProfiler:
+    # target_fps: frame cap of the loop (0 = uncapped), for the budget
+    # window: frames the averages and the graph cover
+    # keep_history: keep every frame for dump() (memory grows with time)
+    def __init__(self, target_fps, window=120, keep_history=False):
+        self.target_fps = target_fps
+        self.phases = []  # In the order they were first seen
+        self.recent = deque(maxlen=window)  # (frame start, {phase: ns}, ticks)
+        self.history = [] if keep_history else None
+        self.current = {}
+        self.ticks = 0
+        self.frame_start = None
+        self.last = None
+        self.latencies = deque(maxlen=window)  # Seconds, most recent presses
+        self.latency_history = [] if keep_history else None
+
+    def begin_frame(self):
+        self.frame_start = self.last = time.perf_counter_ns()
+        self.current = {}
+        self.ticks = 0
+
+    def lap(self, phase):
+        now = time.perf_counter_ns()
+        if phase not in self.current:
+            self.current[phase] = 0
+            if phase not in self.phases:
+                self.phases.append(phase)
+        self.current[phase] += now - self.last
+        self.last = now
+
+    # Simulation ticks run this frame
+    def add_ticks(self, ticks):
+        self.ticks += ticks
+
+    # Time from a key press to the frame showing its move
+    def add_latency(self, seconds):
+        self.latencies.append(seconds)
+        if self.latency_history is not None:
+            self.latency_history.append(seconds)
+
+    # Milliseconds at the 50th/95th percentile and worst, over the
+    # window (or the whole history); None before the first press
+    def latency_stats(self, history=False):
+        samples = self.latency_history if history and self.latency_history is not None else self.latencies
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        count = len(ordered)
+        return {
+            "presses": count,
+            "p50_ms": ordered[(count - 1) // 2] * 1e3,
+            "p95_ms": ordered[min(count - 1, int(count * 0.95))] * 1e3,
+            "max_ms": ordered[-1] * 1e3,
+        }
+
+    def end_frame(self):
+        record = (self.frame_start, self.current, self.ticks)
+        self.recent.append(record)
+        if self.history is not None:
+            self.history.append(record)
+
+    # Average milliseconds per phase over the window
+    def averages(self):
+        frames = max(len(self.recent), 1)
+        totals = dict.fromkeys(self.phases, 0)
+        for _, phases, _ in self.recent:
+            for phase, ns in phases.items():
+                totals[phase] += ns
+        return {phase: ns / frames / 1e6 for phase, ns in totals.items()}
+
+    # Milliseconds of work in the last finished frame
+    def last_frame_ms(self):
+        if not self.recent:
+            return 0.0
+        phases = self.recent[-1][1]
+        return (sum(phases.values()) - phases.get(WAIT_PHASE, 0)) / 1e6
+
+    # Milliseconds of work (everything but waiting) per frame
+    def frame_times(self):
+        return [(sum(phases.values()) - phases.get(WAIT_PHASE, 0)) / 1e6 for _, phases, _ in self.recent]
+
+    # Frames and simulation ticks per second actually reached
+    def actual_rates(self):
+        if len(self.recent) < 2:
+            return 0.0, 0.0
+        elapsed = (self.recent[-1][0] - self.recent[0][0]) / 1e9
+        if elapsed <= 0:
+            return 0.0, 0.0
+        frames = len(self.recent) - 1
+        ticks = sum(record[2] for record in list(self.recent)[:-1])
+        return frames / elapsed, ticks / elapsed
+
+    def budget_ms(self):
+        return 1000 / self.target_fps if self.target_fps else None
+
+    def rows(self):
+        records = self.history if self.history is not None else self.recent
+        first = records[0][0] if records else 0
+        for start, phases, ticks in records:
+            row = {"time_ms": (start - first) / 1e6, "ticks": ticks}
+            for phase in self.phases:
+                row[phase + "_ms"] = phases.get(phase, 0) / 1e6
+            row["total_ms"] = sum(phases.values()) / 1e6
+            yield row
+
+    # Per-frame phase times to .csv, anything else is written as JSON
+    def dump(self, path):
+        rows = list(self.rows())
+        if path.endswith(".csv"):
+            fields = ["time_ms", "ticks"] + [phase + "_ms" for phase in self.phases] + ["total_ms"]
+            with open(path, "w", newline="") as file:
+                writer = csv.DictWriter(file, fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w") as file:
+                json.dump({"target_fps": self.target_fps, "phases": self.phases, "frames": rows,
+                           "input_latency": self.latency_stats(history=True)}, file)
+
+
+# Semi-transparent panel with the profiler numbers. The text is only
+# re-rendered every few frames, so it stays readable and cheap.
+class ProfilerOverlay:
+    def __init__(self, profiler, position=(10, 50), width=300, graph_height=60, refresh=15):
+        self.profiler = profiler
+        self.position = position
+        self.width = width
+        self.graph_height = graph_height
+        self.refresh = refresh
+        self.font = get_font('Arial', 14)
+        self.line_height = self.font.get_linesize()
+        self.visible = False
+        self.frames = 0
+        self.text = []
+        self.panel = None  # Reused; made again only when the number of lines changes
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames = 0
+
+    def update_text(self):
+        profiler = self.profiler
+        fps, tick_rate = profiler.actual_rates()
+        target = profiler.target_fps or "uncapped"
+        lines = [f"FPS {fps:.1f} (target {target})   ticks/s {tick_rate:.1f}"]
+        budget = profiler.budget_ms()
+        averages = profiler.averages()
+        work = sum(ms for phase, ms in averages.items() if phase != WAIT_PHASE)
+        lines.append(f"work {work:.2f} ms" + (f" of {budget:.2f} ms budget" if budget else ""))
+        for phase, ms in averages.items():
+            lines.append(f"  {phase:<12} {ms:6.2f} ms")
+        latency = profiler.latency_stats()
+        if latency is not None:
+            lines.append(f"input latency {latency['p50_ms']:.1f} ms p50, {latency['p95_ms']:.1f} ms p95")
+        self.text = [self.font.render(line, True, OVERLAY_TEXT) for line in lines]
+
+    def draw(self, surface):
+        if self.frames % self.refresh == 0:
+            self.update_text()
+        self.frames += 1
+
+        text_height = len(self.text) * self.line_height
+        height = text_height + self.graph_height + 15
+        panel = self.panel
+        if panel is None or panel.get_height() != height:
+            panel = self.panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        panel.fill(OVERLAY_BACKGROUND)
+        for i, line in enumerate(self.text):
+            panel.blit(line, (5, 5 + i * self.line_height))
+        self.draw_graph(panel, 5 + text_height + 5)
+        return surface.blit(panel, self.position)
+
+    # One column per frame, scaled so twice the budget fills the graph
+    def draw_graph(self, panel, top):
+        times = self.profiler.frame_times()
+        budget = self.profiler.budget_ms()
+        scale_ms = budget * 2 if budget else max(times, default=1) or 1
+        bottom = top + self.graph_height
+        columns = times[-(self.width - 10):]
+        for i, ms in enumerate(columns):
+            height = min(self.graph_height, ms / scale_ms * self.graph_height)
+            color = GRAPH_SLOW if budget and ms > budget else GRAPH_OK
+            pygame.draw.line(panel, color, (5 + i, bottom), (5 + i, bottom - height))
+        if budget:
+            y = bottom - self.graph_height // 2
+            pygame.draw.line(panel, GRAPH_BUDGET, (5, y), (self.width - 5, y))
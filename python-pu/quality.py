@@ -0,0 +1,102 @@
+from collections import deque, namedtuple
+
+# Adaptive drawing quality. The frame budget is fixed by the frame cap,
+# but the work per frame grows with the speed level (more simulation
+# ticks per frame). QualityController watches the measured work per
+# frame and steps the renderer's quality down when frames keep missing
+# the budget and back up after a long stretch with plenty of headroom.
+#
+# Hysteresis, so it doesn't flip between two levels: going down needs
+# the average over SAMPLE_FRAMES above the budget, going up needs it
+# below HEADROOM of the budget for UP_FRAMES frames in a row (much
+# longer), and after every change the samples start over and nothing
+# changes for COOLDOWN_FRAMES. A level that was left upward and failed
+# again soon after waits twice as long before it is tried again.
+
+# Detail of one quality level (see Renderer.set_quality):
+#   chicken_animated  wings and head move (False: one cached frame)
+#   portal_animated   the portal strip is redrawn every frame (False:
+#                     one frame baked into the background)
+#   decorations       road markings and safe zone dots
+#   scale             internal resolution, scaled up to the window with
+#                     pygame.transform.scale (1 = draw at full size)
+QualityLevel = namedtuple("QualityLevel", "name chicken_animated portal_animated decorations scale")
+
+QUALITY_LEVELS = (
+    QualityLevel("full", True, True, True, 1),
+    QualityLevel("simple chicken", False, True, True, 1),
+    QualityLevel("static portal", False, False, True, 1),
+    QualityLevel("plain lanes", False, False, False, 1),
+    QualityLevel("half resolution", False, False, False, 0.5),
+)
+
+SAMPLE_FRAMES = 30     # Frames averaged before stepping down
+UP_FRAMES = 240        # Frames with headroom in a row before stepping up
+HEADROOM = 0.5         # Fraction of the budget that counts as headroom
+COOLDOWN_FRAMES = 60   # Frames after a change before the next one
+RETRY_FRAMES = 600     # A level failing within this many frames of going up doubles its UP_FRAMES
+
+
+class QualityController:
+    # budget_ms: work allowed per frame; on_change(level) is called with
+    # the new QualityLevel when the level changes
+    def __init__(self, budget_ms, on_change=None, levels=QUALITY_LEVELS):
+        self.budget_ms = budget_ms
+        self.on_change = on_change
+        self.levels = levels
+        self.level = 0
+        self.samples = deque(maxlen=SAMPLE_FRAMES)
+        self.total = 0.0  # Sum of samples
+        self.headroom_frames = 0
+        self.cooldown = 0
+        self.frames_since_up = None
+        self.up_frames = [UP_FRAMES] * len(levels)  # Per level, to go up to it
+        self.changes = 0
+
+    @property
+    def current(self):
+        return self.levels[self.level]
+
+    # Work of the last frame in milliseconds; returns True when the level changed
+    def update(self, work_ms):
+        if self.frames_since_up is not None:
+            self.frames_since_up += 1
+        if self.cooldown:
+            self.cooldown -= 1
+            return False
+
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(work_ms)
+        self.total += work_ms
+        average = self.total / len(self.samples)
+
+        if len(self.samples) == self.samples.maxlen and average > self.budget_ms:
+            if self.level + 1 < len(self.levels):
+                if self.frames_since_up is not None and self.frames_since_up < RETRY_FRAMES:
+                    # The level we just went up to can't hold the budget
+                    self.up_frames[self.level] *= 2
+                self.set_level(self.level + 1)
+                self.frames_since_up = None
+                return True
+            return False
+
+        if work_ms < self.budget_ms * HEADROOM:
+            self.headroom_frames += 1
+        else:
+            self.headroom_frames = 0
+        if self.level > 0 and self.headroom_frames >= self.up_frames[self.level - 1]:
+            self.set_level(self.level - 1)
+            self.frames_since_up = 0
+            return True
+        return False
+
+    def set_level(self, level):
+        self.level = level
+        self.samples.clear()
+        self.total = 0.0
+        self.headroom_frames = 0
+        self.cooldown = COOLDOWN_FRAMES
+        self.changes += 1
+        if self.on_change is not None:
+            self.on_change(self.levels[level])
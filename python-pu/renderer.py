@@ -0,0 +1,303 @@
+import pygame
+import math
+from game_core import GRID_SIZE, BASE_FPS, PORTAL_CYCLE, PORTAL_STEP
+from sprites import ChickenSprites, CarAtlas, PortalFrames
+from hud import get_font, CachedText
+from profiler import ProfilerOverlay
+
+# pygame front end for game_core.Game: draws the game state, nothing here
+# changes it.
+
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+GREEN = (100, 200, 100)  # Safe zone color
+GRAY = (100, 100, 100)
+BLUE = (0, 100, 255)   # Portal color
+
+# Chicken colors: body, wings, beak, feet, comb
+CHICKEN_COLORS = (
+    (255, 220, 150),  # Light yellow body
+    (255, 200, 120),  # Slightly darker wings
+    (255, 180, 50),   # Orange beak
+    (255, 200, 0),    # Yellow feet
+    (255, 50, 50),    # Red comb
+)
+
+# Enhanced Portal with animation
+PORTAL_Y = 0
+PORTAL_HEIGHT = GRID_SIZE
+
+
+def draw_portal(surface, portal_frame, width):
+    for i in range(0, width, 20):
+        offset = math.sin(portal_frame + i/50) * 5
+        pygame.draw.arc(surface, BLUE, (i-10, PORTAL_Y-5 + offset, 20, PORTAL_HEIGHT+10),
+                        0, 3.14, 3)
+        pygame.draw.arc(surface, WHITE, (i-8, PORTAL_Y-3 + offset, 16, PORTAL_HEIGHT+6),
+                        0, 3.14, 2)
+
+
+# decorations=False leaves out the road markings and safe zone pattern
+def draw_lanes(surface, lanes, width, height, decorations=True):
+    for lane_type, y in lanes:
+        if -GRID_SIZE <= y <= height:  # Only draw visible lanes
+            if lane_type == "grass":
+                pygame.draw.rect(surface, GREEN, (0, y, width, GRID_SIZE))
+            elif lane_type == "road":
+                pygame.draw.rect(surface, GRAY, (0, y, width, GRID_SIZE))
+                # Draw road markings
+                for x in range(0, width, GRID_SIZE * 2) if decorations else ():
+                    pygame.draw.rect(surface, WHITE, (x, y + GRID_SIZE//2 - 2, GRID_SIZE, 4))
+            elif lane_type == "safe_zone":
+                pygame.draw.rect(surface, GREEN, (0, y, width, GRID_SIZE))
+                # Draw safe zone pattern
+                for x in range(0, width, GRID_SIZE) if decorations else ():
+                    pygame.draw.circle(surface, (150, 220, 150), (x + GRID_SIZE//2, y + GRID_SIZE//2), 5)
+
+
+class Renderer:
+    # dirty_rects=True restores and updates only the regions that moving
+    # objects touched, False redraws everything and flips the full window.
+    # portal_frames: frames of the pre-rendered portal animation (see
+    # sprites.PortalFrames, None = one per step of the cycle)
+    def __init__(self, screen, game, dirty_rects=True,
+                 chicken_phase_steps=None, chicken_cache_bytes=4 * 1024 * 1024, profiler=None,
+                 portal_frames=None):
+        self.screen = screen
+        self.width, self.height = screen.get_size()
+        self.dirty_rects_enabled = dirty_rects
+        # Optional profiler.FrameProfiler, gets a lap per draw phase
+        self.profiler = profiler
+        self.profiler_overlay = ProfilerOverlay(profiler) if profiler is not None else None
+
+        self.chicken_sprites = ChickenSprites(game.player.width, game.player.height, CHICKEN_COLORS,
+                                              chicken_phase_steps, chicken_cache_bytes)
+        self.chicken_sprites.prerender()
+        self.chicken_phase_steps = chicken_phase_steps
+        self.car_atlas = CarAtlas(GRID_SIZE - 5)
+
+        # Detail settings, see set_quality
+        self.portal_animated = True
+        self.decorations = True
+        self.scale = 1
+        self.canvas = None          # Lower resolution drawing surface when scale < 1
+        self.scaled_sprites = {}    # Sprite key -> sprite at scale
+
+        # Area the portal arcs can touch (clipped to the window)
+        self.portal_rect = pygame.Rect(0, PORTAL_Y - 10, self.width, PORTAL_HEIGHT + 20).clip(screen.get_rect())
+        self.portal_frames_count = portal_frames
+        self.portal_lanes = None
+        self.build_background(game.lanes)
+
+        # HUD text, only re-rendered when the values change
+        hud_font = get_font('Arial', 28, bold=True)
+        self.score_label = CachedText(hud_font, "Score: {}")
+        self.high_score_label = CachedText(hud_font, "High Score: {}")
+        self.fps_label = CachedText(hud_font, "Speed: {}")
+        self.game_over_text = hud_font.render("GAME OVER! Press R to restart", True, WHITE)
+
+        # Regions drawn over the background last frame
+        self.dirty_rects = []
+        screen.blit(self.background, (0, 0))
+        pygame.display.flip()
+
+    def build_background(self, lanes):
+        # Static background: the lanes never change, so compose them once
+        self.lanes = lanes
+        if self.portal_lanes is not lanes:
+            self.build_portal(lanes)
+        self.background = pygame.Surface((self.width, self.height)).convert()
+        self.background.fill(BLACK)
+        draw_lanes(self.background, lanes, self.width, self.height, self.decorations)
+        if not self.portal_animated:
+            self.portal.draw(self.background, 0)  # A still portal is part of the background
+
+        # One row of each lane type, for scrolling views
+        self.lane_tiles = {}
+        for lane_type in ("grass", "road", "safe_zone"):
+            tile = pygame.Surface((self.width, GRID_SIZE)).convert()
+            draw_lanes(tile, [(lane_type, 0)], self.width, GRID_SIZE, self.decorations)
+            self.lane_tiles[lane_type] = tile
+
+        if self.scale != 1:
+            self.canvas = pygame.Surface(self.scaled_size((self.width, self.height))).convert()
+            self.small_background = pygame.transform.scale(self.background, self.canvas.get_size())
+        # Everything has to be redrawn over the new background
+        self.dirty_rects = [self.screen.get_rect()]
+
+    def build_portal(self, lanes):
+        self.portal_lanes = lanes
+        # The portal is drawn underneath the lanes, keep a transparent copy of
+        # the lanes over the portal strip to put back on top of it
+        lane_layer = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        draw_lanes(lane_layer, lanes, self.width, self.height)
+        self.portal_overlay = lane_layer.subsurface(self.portal_rect).copy()
+        # The portal strip (portal, then the lanes on top) for every frame
+        # of the animation, drawn up front instead of as arcs every frame
+        self.portal = PortalFrames(self.portal_rect, self.draw_portal, PORTAL_CYCLE, PORTAL_STEP,
+                                   self.portal_overlay, BLACK, self.portal_frames_count)
+        self.portal.prerender()
+
+    # Detail settings of a quality.QualityLevel
+    def set_quality(self, level):
+        self.chicken_sprites.phase_steps = self.chicken_phase_steps if level.chicken_animated else 1
+        self.portal_animated = level.portal_animated
+        self.decorations = level.decorations
+        if level.scale != self.scale:
+            self.scale = level.scale
+            self.scaled_sprites.clear()
+            self.canvas = None
+        self.build_background(self.lanes)
+
+    def scaled_size(self, size):
+        return max(1, round(size[0] * self.scale)), max(1, round(size[1] * self.scale))
+
+    # A sprite at the internal resolution, made once per key
+    def scaled_sprite(self, key, sprite):
+        scaled = self.scaled_sprites.get(key)
+        if scaled is None:
+            scaled = self.scaled_sprites[key] = pygame.transform.scale(sprite, self.scaled_size(sprite.get_size()))
+        return scaled
+
+    # Portal and lanes; returns the list of regions drawn this frame
+    def draw_background(self, game):
+        screen = self.screen
+        if self.dirty_rects_enabled:
+            # Restore the background where moving objects were last frame
+            for rect in self.dirty_rects:
+                screen.blit(self.background, rect, rect)
+            if not self.portal_animated:
+                return []
+            # Portal strip: portal first, lanes on top (same order as a full redraw)
+            self.portal.draw(screen, game.portal_frame)
+            return [self.portal_rect]
+
+        screen.fill(BLACK)
+        self.portal.draw(screen, game.portal_frame if self.portal_animated else 0)
+        draw_lanes(screen, self.lanes, self.width, self.height, self.decorations)
+        return []
+
+    def draw_portal(self, surface, portal_frame):
+        draw_portal(surface, portal_frame, self.width)
+
+    # Lanes of a game whose view scrolls (endless mode, no portal): the
+    # whole window changes whenever the view moves
+    def draw_scrolling_background(self, game):
+        screen = self.screen
+        screen.fill(BLACK)
+        for lane_type, y in game.lanes:
+            y -= game.camera_y
+            if -GRID_SIZE < y < self.height:
+                screen.blit(self.lane_tiles[lane_type], (0, y))
+        return [screen.get_rect()]
+
+    def draw_cars(self, cars, alpha, drawn_rects, camera_y=0):
+        # Draw cars (only visible ones), interpolated between the last two ticks
+        for car in cars:
+            y = car.y - camera_y
+            if -car.height <= y <= self.height:  # Only draw visible cars
+                x = car.prev_x + (car.x - car.prev_x) * alpha
+                drawn_rects.append(self.car_atlas.draw(self.screen, car, x, y))
+
+    def draw_player(self, player, drawn_rects, camera_y=0):
+        drawn_rects.append(self.chicken_sprites.draw(self.screen, player.x, player.y - camera_y,
+                                                     player.head_bob, player.wing_flap))
+
+    def draw_hud(self, game, drawn_rects):
+        screen = self.screen
+        # Draw score and high score
+        score_text = self.score_label.render(game.score, WHITE)
+        drawn_rects.append(screen.blit(score_text, (10, 10)))
+
+        high_score_text = self.high_score_label.render(game.high_score, WHITE)
+        drawn_rects.append(screen.blit(high_score_text, (self.width - high_score_text.get_width() - 10, 10)))
+
+        # Draw current speed with warning color when high
+        fps_color = WHITE if game.sim_speed < 3 else (255, 100, 100)
+        fps_text = self.fps_label.render(round(BASE_FPS * game.sim_speed), fps_color)
+        drawn_rects.append(screen.blit(fps_text, (self.width // 2 - fps_text.get_width() // 2, 10)))
+
+        # Draw game over screen
+        if game.game_over:
+            drawn_rects.append(screen.blit(self.game_over_text, (self.width//2 - 150, self.height//2)))
+
+    def present(self, drawn_rects):
+        if self.dirty_rects_enabled:
+            # Push what was erased and what was drawn this frame
+            pygame.display.update(self.dirty_rects + drawn_rects)
+            self.dirty_rects = drawn_rects
+        else:
+            pygame.display.flip()
+
+    # The moving parts drawn at the internal resolution on the canvas,
+    # which is then scaled up to the window (the HUD is drawn after, at
+    # full size). The whole window is updated.
+    def draw_scaled(self, game, alpha, lap):
+        canvas = self.canvas
+        scale = self.scale
+        camera_y = game.camera_y
+        if game.scrolls:
+            canvas.fill(BLACK)
+            for lane_type, y in game.lanes:
+                y -= camera_y
+                if -GRID_SIZE < y < self.height:
+                    canvas.blit(self.scaled_sprite(lane_type, self.lane_tiles[lane_type]), (0, y * scale))
+        else:
+            if game.lanes is not self.lanes:
+                self.build_background(game.lanes)
+            canvas.blit(self.small_background, (0, 0))
+        lap("background")
+        atlas = self.car_atlas
+        for car in game.cars:
+            y = car.y - camera_y
+            if -car.height <= y <= self.height:
+                key = (car.color, car.width, car.direction)
+                x = car.prev_x + (car.x - car.prev_x) * alpha
+                canvas.blit(self.scaled_sprite(key, atlas.get(*key)), ((int(x) - atlas.PAD_LEFT) * scale, y * scale))
+        lap("cars")
+        player = game.player
+        sprites = self.chicken_sprites
+        frame = sprites.get(player.head_bob, player.wing_flap)
+        key = ("chicken",) + sprites.frame_key(player.head_bob, player.wing_flap)
+        canvas.blit(self.scaled_sprite(key, frame),
+                    ((player.x - sprites.pad) * scale, (player.y - camera_y - sprites.pad) * scale))
+        lap("player")
+        pygame.transform.scale(canvas, (self.width, self.height), self.screen)
+        drawn_rects = [self.screen.get_rect()]
+        self.draw_hud(game, drawn_rects)
+        lap("hud")
+        if self.profiler_overlay is not None and self.profiler_overlay.visible:
+            self.profiler_overlay.draw(self.screen)
+            lap("overlay")
+        pygame.display.flip()
+        # Back at full resolution everything is redrawn once
+        self.dirty_rects = drawn_rects
+        lap("present")
+
+    def draw(self, game, alpha=1.0):
+        lap = self.profiler.lap if self.profiler is not None else no_lap
+        if self.scale != 1:
+            self.draw_scaled(game, alpha, lap)
+            return
+        if game.scrolls:
+            drawn_rects = self.draw_scrolling_background(game)
+        else:
+            if game.lanes is not self.lanes:
+                self.build_background(game.lanes)
+            drawn_rects = self.draw_background(game)
+        lap("background")
+        self.draw_cars(game.cars, alpha, drawn_rects, game.camera_y)
+        lap("cars")
+        self.draw_player(game.player, drawn_rects, game.camera_y)
+        lap("player")
+        self.draw_hud(game, drawn_rects)
+        lap("hud")
+        if self.profiler_overlay is not None and self.profiler_overlay.visible:
+            drawn_rects.append(self.profiler_overlay.draw(self.screen))
+            lap("overlay")
+        self.present(drawn_rects)
+        lap("present")
+
+
+def no_lap(phase):
+    pass
@@ -0,0 +1,203 @@
+import struct
+import sys
+import time
+import zlib
+from game_core import Game, Inputs, NO_INPUT, BASE_FPS
+from endless import EndlessGame
+
+# Recording and replay of a game: the game seed plus the Inputs of every
+# tick that had any. A game_core.Game is deterministic given its seed and
+# inputs, so that is all it takes to play a session back exactly.
+#
+# File layout (little endian):
+#   header   b"CRRP", version (1 byte), game seed (8 bytes), flags (1 byte)
+#   events   tick delta since the previous event (varint), event code (1 byte)
+#   end      tick delta to the last tick (varint), END, score (varint),
+#            crc32 of the final state (4 bytes)
+# An event code packs one Inputs: move action in the low 3 bits, then the
+# release and restart flags. Most events are 2 bytes. The flags hold the
+# Game options that change how it plays, so a replay is played back with
+# the same ones.
+
+MAGIC = b"CRRP"
+VERSION = 1
+HEADER = struct.Struct("<4sBQB")
+PREDICT_FLAG = 0x01   # collision="predict"
+SOLVABLE_FLAG = 0x02  # solvable=True
+ENDLESS_FLAG = 0x04   # endless.EndlessGame
+END = 0xFF
+RELEASE_BIT = 0x08
+RESTART_BIT = 0x10
+
+
+class ReplayError(Exception):
+    pass
+
+
+def encode_inputs(inputs):
+    code = inputs.move
+    if inputs.release:
+        code |= RELEASE_BIT
+    if inputs.restart:
+        code |= RESTART_BIT
+    return code
+
+
+def decode_inputs(code):
+    return Inputs(code & 0x07, bool(code & RELEASE_BIT), bool(code & RESTART_BIT))
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("Replay file is truncated")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+# The flags of a game's options
+def game_flags(game):
+    flags = 0
+    if game.collision == "predict":
+        flags |= PREDICT_FLAG
+    if game.level_checker is not None:
+        flags |= SOLVABLE_FLAG
+    if isinstance(game, EndlessGame):
+        flags |= ENDLESS_FLAG
+    return flags
+
+
+# Fingerprint of the state a replay has to end in
+def state_digest(game):
+    player = game.player
+    state = [game.tick, game.score, game.game_over, game.run_seed, player.x, player.y]
+    state.extend(float(car.x) for car in game.cars)
+    return zlib.crc32(repr(state).encode())
+
+
+# Collects the inputs of a running game; save() writes the file
+class ReplayRecorder:
+    def __init__(self, seed, flags=0):
+        self.seed = seed
+        self.flags = flags
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, seed, flags))
+        self.last_tick = 0
+
+    # Call with the game's tick before game.step(inputs)
+    def record(self, tick, inputs):
+        if inputs == NO_INPUT:
+            return
+        write_varint(self.data, tick - self.last_tick)
+        self.data.append(encode_inputs(inputs))
+        self.last_tick = tick
+
+    def save(self, path, game):
+        data = bytearray(self.data)
+        write_varint(data, game.tick - self.last_tick)
+        data.append(END)
+        write_varint(data, game.score)
+        data += struct.pack("<I", state_digest(game))
+        with open(path, "wb") as file:
+            file.write(data)
+
+
+class Replay:
+    def __init__(self, seed, events, end_tick, score, digest, flags=0):
+        self.seed = seed
+        self.flags = flags
+        self.events = events      # tick -> Inputs
+        self.end_tick = end_tick  # Tick count when the recording stopped
+        self.score = score
+        self.digest = digest
+
+    def inputs(self, tick):
+        return self.events.get(tick, NO_INPUT)
+
+    def verify(self, game):
+        return game.tick == self.end_tick and state_digest(game) == self.digest
+
+    # A Game (or EndlessGame) with the recorded seed and options
+    def new_game(self, **kwargs):
+        game_class = EndlessGame if self.flags & ENDLESS_FLAG else Game
+        return game_class(seed=self.seed, collision="predict" if self.flags & PREDICT_FLAG else "test",
+                          solvable=bool(self.flags & SOLVABLE_FLAG), **kwargs)
+
+
+def load_replay(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size:
+        raise ReplayError("Not a replay file")
+    magic, version, seed, flags = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError("Not a replay file")
+    if version != VERSION:
+        raise ReplayError(f"Unsupported replay version {version}")
+
+    events = {}
+    tick = 0
+    pos = HEADER.size
+    while True:
+        delta, pos = read_varint(data, pos)
+        if pos >= len(data):
+            raise ReplayError("Replay file is truncated")
+        tick += delta
+        code = data[pos]
+        pos += 1
+        if code == END:
+            break
+        events[tick] = decode_inputs(code)
+    score, pos = read_varint(data, pos)
+    if pos + 4 > len(data):
+        raise ReplayError("Replay file is truncated")
+    digest, = struct.unpack_from("<I", data, pos)
+    return Replay(seed, events, tick, score, digest, flags)
+
+
+# Run a replay headless as fast as possible; returns the finished game
+def fast_forward(replay, car_store="lanes"):
+    game = replay.new_game(car_store=car_store)
+    events = replay.events
+    step = game.step
+    for tick in range(replay.end_tick):
+        step(events.get(tick, NO_INPUT))
+    return game
+
+
+# python replay.py run.crr [...]  checks that each recording still plays
+# back to the state it was recorded with
+def main(paths):
+    if not paths:
+        print("usage: python replay.py REPLAY [REPLAY ...]")
+        return 2
+    failed = 0
+    for path in paths:
+        replay = load_replay(path)
+        start = time.perf_counter()
+        game = fast_forward(replay)
+        elapsed = time.perf_counter() - start
+        ok = replay.verify(game)
+        if not ok:
+            failed += 1
+        minutes = replay.end_tick / BASE_FPS / 60
+        print(f"{path}: {'ok' if ok else 'MISMATCH'}  ticks {replay.end_tick} (~{minutes:.1f} min at 1x)  "
+              f"score {game.score} (recorded {replay.score})  {elapsed:.3f}s  "
+              f"{replay.end_tick / max(elapsed, 1e-9):,.0f} ticks/s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,351 @@
+import pygame
+import math
+import random
+from collections import OrderedDict
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+# head_bob / wing_flap wrap at this value in Player.draw
+PHASE_PERIOD = 6.28
+
+
+# Procedural chicken, drawn with its top-left corner at (x, y).
+# This is the original Player.draw code, only the target surface,
+# position and animation offsets are passed in.
+def draw_chicken(surface, x, y, width, height, head_offset, flap_offset, colors):
+    body_color, wing_color, beak_color, feet_color, comb_color = colors
+
+    # Body (main oval)
+    pygame.draw.ellipse(surface, body_color,
+                      (x + width//4, y + height//4,
+                       width//1.8, height//1.2))
+
+    # Head (circle with bobbing effect)
+    head_radius = width//3.5
+    head_x = x + width//2
+    head_y = y + head_radius//2 - head_offset
+    pygame.draw.circle(surface, body_color, (head_x, head_y), head_radius)
+
+    # Eyes (with cute white reflection)
+    eye_radius = head_radius//4
+    pygame.draw.circle(surface, BLACK,
+                     (head_x + head_radius//3, head_y - head_radius//6),
+                     eye_radius)
+    pygame.draw.circle(surface, WHITE,
+                     (head_x + head_radius//3 + 2, head_y - head_radius//6 - 2),
+                     eye_radius//3)
+
+    # Beak (triangle with shading)
+    beak_points = [
+        (head_x + head_radius//1.5, head_y),
+        (head_x + head_radius//1.5 + head_radius//2, head_y - head_radius//4),
+        (head_x + head_radius//1.5 + head_radius//2, head_y + head_radius//4)
+    ]
+    pygame.draw.polygon(surface, beak_color, beak_points)
+    pygame.draw.polygon(surface, (255, 160, 40), beak_points, 1)  # Beak outline
+
+    # Comb (more feather-like)
+    comb_height = head_radius//1.5
+    for i in range(3):  # Three comb points
+        comb_width = head_radius//(2 + i/2)
+        pygame.draw.polygon(surface, comb_color, [
+            (head_x - head_radius//2 + i*head_radius//3, head_y - head_radius),
+            (head_x - head_radius//3 + i*head_radius//3, head_y - head_radius - comb_height),
+            (head_x - head_radius//3 + i*head_radius//3 + comb_width, head_y - head_radius)
+        ])
+
+    # Left wing (three feathers)
+    for i in range(3):
+        wing_length = width//(2 + i/3)
+        pygame.draw.ellipse(surface, wing_color,
+                          (x + width//6 - i*2,
+                           y + height//3 + flap_offset + i*3,
+                           wing_length, height//4))
+
+    # Right wing (mirrored)
+    for i in range(3):
+        wing_length = width//(2 + i/3)
+        pygame.draw.ellipse(surface, wing_color,
+                          (x + 2*width//3 + i*2,
+                           y + height//3 + flap_offset + i*3,
+                           wing_length, height//4))
+
+    # Tail feathers (three distinct feathers)
+    tail_length = width//2
+    for i in range(3):
+        angle = -30 + i*30  # Spread out feathers
+        feather_x = x + width//2 + math.cos(math.radians(angle)) * tail_length//2
+        feather_y = y + height//1.2 + math.sin(math.radians(angle)) * tail_length//3
+        pygame.draw.ellipse(surface, wing_color,
+                          (feather_x - tail_length//4, feather_y - height//8,
+                           tail_length//2, height//4))
+
+    # Feet (two toes forward, one back)
+    foot_y = y + height
+    for foot_x in (x + width//3, x + 2*width//3):
+        pygame.draw.line(surface, feet_color,
+                       (foot_x, foot_y),
+                       (foot_x - width//6, foot_y + height//4), 3)
+        pygame.draw.line(surface, feet_color,
+                       (foot_x, foot_y),
+                       (foot_x + width//8, foot_y + height//4), 3)
+        pygame.draw.line(surface, feet_color,
+                       (foot_x, foot_y),
+                       (foot_x, foot_y + height//5), 3)  # Back toe
+
+
+CAR_WHEEL_COLOR = (40, 40, 40)
+CAR_WINDOW_COLOR = (200, 230, 255)
+
+
+# Procedural car, drawn with its top-left corner at (x, y).
+# This is the original Car.draw code.
+def draw_car(surface, x, y, width, height, color, direction):
+    # Main car body
+    pygame.draw.rect(surface, color, (x, y, width, height))
+
+    # Car windows
+    window_width = width // 3
+    pygame.draw.rect(surface, CAR_WINDOW_COLOR,
+                    (x + window_width//2, y + 5, window_width, height//3))
+    pygame.draw.rect(surface, CAR_WINDOW_COLOR,
+                    (x + width - window_width*1.2, y + 5, window_width, height//3))
+
+    # Wheels
+    wheel_radius = height // 4
+    pygame.draw.circle(surface, CAR_WHEEL_COLOR,
+                      (x + wheel_radius, y + height - wheel_radius//2), wheel_radius)
+    pygame.draw.circle(surface, CAR_WHEEL_COLOR,
+                      (x + width - wheel_radius, y + height - wheel_radius//2), wheel_radius)
+
+    # Headlights/tail lights based on direction
+    light_color = (255, 255, 200) if direction > 0 else (255, 100, 100)
+    light_pos = x + (width if direction > 0 else 0)
+    pygame.draw.rect(surface, light_color, (light_pos - 5, y + 5, 5, 5))
+
+
+# The portal animation, pre-rendered: portal_frame goes around a fixed
+# cycle, so each step of it is drawn once into a slot of one tall sheet
+# and a frame is then a single blit of that slot (a subsurface view).
+# draw(surface, phase) draws the portal in window coordinates; rect is
+# the window area it covers, and overlay (the lanes in front of the
+# portal, with alpha) is drawn over it in each frame. frames picks how
+# many steps of the cycle get their own frame: None keeps one per step
+# (looks like drawing every frame), fewer save memory and make the
+# animation coarser. When the overlay is opaque all over, no step of the
+# animation shows through and a single frame is kept. Frames are
+# rendered on first use or by prerender.
+# Whether every pixel of an SRCALPHA surface is fully opaque
+def covers(surface):
+    width, height = surface.get_size()
+    return pygame.mask.from_surface(surface, 254).count() == width * height
+
+
+class PortalFrames:
+    def __init__(self, rect, draw, cycle, step, overlay=None, background=BLACK, frames=None):
+        self.rect = pygame.Rect(rect)
+        self.draw_portal = draw
+        self.cycle = cycle
+        self.overlay = overlay
+        self.background = background
+        if overlay is not None and covers(overlay):
+            self.frames = 1
+        else:
+            self.frames = frames or round(cycle / step)
+        width, height = self.rect.size
+        self.sheet = pygame.Surface((width, height * self.frames))
+        if pygame.display.get_surface() is not None:
+            self.sheet = self.sheet.convert()
+        self.views = [self.sheet.subsurface((0, i * height, width, height)) for i in range(self.frames)]
+        self.rendered = [False] * self.frames
+        # Window-sized scratch area to draw a frame in before copying its rect
+        self.scratch = None
+
+    def index(self, phase):
+        return round(phase * self.frames / self.cycle) % self.frames
+
+    def render_frame(self, index):
+        if self.scratch is None:
+            self.scratch = pygame.Surface(self.rect.bottomright)
+        self.scratch.fill(self.background, self.rect)
+        self.draw_portal(self.scratch, index * self.cycle / self.frames)
+        view = self.views[index]
+        view.blit(self.scratch, (0, 0), self.rect)
+        if self.overlay is not None:
+            view.blit(self.overlay, (0, 0))
+        self.rendered[index] = True
+
+    def prerender(self):
+        for index in range(self.frames):
+            if not self.rendered[index]:
+                self.render_frame(index)
+        self.scratch = None
+
+    def get(self, phase):
+        index = self.index(phase)
+        if not self.rendered[index]:
+            self.render_frame(index)
+        return self.views[index]
+
+    def draw(self, surface, phase):
+        return surface.blit(self.get(phase), self.rect)
+
+    def memory_bytes(self):
+        return self.sheet.get_width() * self.sheet.get_height() * self.sheet.get_bytesize()
+
+
+# Shared atlas of car sprites. Every distinct (color, width, direction)
+# is rendered once and reused by all cars, also across generate_cars
+# resets. hits / misses show whether the atlas stays bounded.
+class CarAtlas:
+    # The tail light sticks out 5px on the left, the wheels below the body
+    PAD_LEFT = 5
+
+    def __init__(self, height):
+        self.height = height
+        self.pad_bottom = height // 4
+        self.sprites = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, color, width, direction):
+        key = (color, width, direction)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = pygame.Surface((width + self.PAD_LEFT, self.height + self.pad_bottom), pygame.SRCALPHA)
+        draw_car(sprite, self.PAD_LEFT, 0, width, self.height, color, direction)
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        self.sprites[key] = sprite
+        return sprite
+
+    def draw(self, surface, car, x=None, y=None):
+        if x is None:
+            x = car.x
+        if y is None:
+            y = car.y
+        sprite = self.get(car.color, car.width, car.direction)
+        return surface.blit(sprite, (int(x) - self.PAD_LEFT, y))
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "sprites": len(self.sprites),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Grass with randomly placed blades, drawn once into a texture
+# (same blade pattern the grass area used to re-roll every frame)
+def make_grass_texture(width, height, base_color, blade_color, rng):
+    texture = pygame.Surface((width, height))
+    texture.fill(base_color)
+    for x in range(0, width, 5):
+        for y in range(0, height, 10):
+            if rng.random() > 0.7:  # Only draw some grass blades
+                blade_x = x + rng.randint(-2, 2)
+                blade_height = rng.randint(3, 7)
+                pygame.draw.line(texture, blade_color,
+                                (blade_x, y + rng.randint(0, 5)),
+                                (blade_x + rng.randint(-2, 2), y - blade_height),
+                                1)
+    if pygame.display.get_surface() is not None:
+        texture = texture.convert()
+    return texture
+
+
+# A few seeded grass textures cycled over time, which keeps the
+# shimmer of the old per-frame blades without generating them.
+# variants=1 gives still grass.
+class GrassTextures:
+    def __init__(self, size, base_color, blade_color, seed, variants=1, frames_per_variant=1):
+        rng = random.Random(seed)
+        self.textures = [make_grass_texture(size[0], size[1], base_color, blade_color, rng)
+                         for _ in range(variants)]
+        self.frames_per_variant = frames_per_variant
+        self.frame = 0
+
+    def next_texture(self):
+        index = (self.frame // self.frames_per_variant) % len(self.textures)
+        self.frame += 1
+        return self.textures[index]
+
+
+# Cache of pre-rendered chicken frames keyed by animation phase.
+# pygame truncates float coordinates, so the drawing only changes when
+# the head or wing offset crosses a whole pixel. Frames are keyed by
+# those pixel offsets, which makes the blit match the procedural drawing.
+# phase_steps quantizes head_bob / wing_flap to that many steps per cycle
+# first (None keeps the full resolution, 1 freezes the animation).
+# Frames are rendered on first use (or up front with prerender) and the
+# least recently used ones are dropped once max_bytes is exceeded.
+class ChickenSprites:
+    def __init__(self, width, height, colors, phase_steps=None, max_bytes=4 * 1024 * 1024):
+        self.width = width
+        self.height = height
+        self.colors = colors
+        self.phase_steps = phase_steps
+        self.max_bytes = max_bytes
+        # Comb, wings and feet stick out of the width x height box
+        self.pad = int(max(width, height)) // 2
+        self.size = (int(width) + 2 * self.pad, int(height) + 2 * self.pad)
+        self.frame_bytes = self.size[0] * self.size[1] * 4
+        self.frames = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def quantize(self, phase):
+        if not self.phase_steps:
+            return phase
+        step = round(phase * self.phase_steps / PHASE_PERIOD) % self.phase_steps
+        return step * PHASE_PERIOD / self.phase_steps
+
+    def frame_key(self, head_bob, wing_flap):
+        head_offset = math.sin(self.quantize(head_bob)) * 2
+        flap_offset = math.sin(self.quantize(wing_flap)) * 4
+        return (math.floor(-head_offset), math.floor(flap_offset))
+
+    def render_frame(self, key):
+        head_shift, flap_shift = key
+        frame = pygame.Surface(self.size, pygame.SRCALPHA)
+        draw_chicken(frame, self.pad, self.pad, self.width, self.height,
+                     -head_shift, flap_shift, self.colors)
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert_alpha()
+        return frame
+
+    def get(self, head_bob, wing_flap):
+        key = self.frame_key(head_bob, wing_flap)
+        frame = self.frames.get(key)
+        if frame is not None:
+            self.hits += 1
+            self.frames.move_to_end(key)
+            return frame
+
+        self.misses += 1
+        frame = self.render_frame(key)
+        self.frames[key] = frame
+        while len(self.frames) > 1 and len(self.frames) * self.frame_bytes > self.max_bytes:
+            self.frames.popitem(last=False)
+        return frame
+
+    # Render the frames a freshly created Player walks through
+    # (wing_flap advances twice as fast as head_bob)
+    def prerender(self):
+        steps = self.phase_steps or 128
+        for i in range(steps):
+            head_bob = i * PHASE_PERIOD / steps
+            self.get(head_bob, (2 * head_bob) % PHASE_PERIOD)
+
+    def draw(self, surface, x, y, head_bob, wing_flap):
+        return surface.blit(self.get(head_bob, wing_flap), (x - self.pad, y - self.pad))
+
+    def memory_bytes(self):
+        return len(self.frames) * self.frame_bytes
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The game modules sit next to this directory and import each other by
+# plain name, as when the game is run from python-pu
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
@@ -0,0 +1,85 @@
+import gc
+import random
+import tracemalloc
+import pytest
+import legacy_game
+from game_core import Game, Inputs, UP, GRID_SIZE, generate_cars
+from car_store import LaneIndexedCarList
+
+# Steady play and restarts don't keep allocating: cars come from the
+# pools, lane lists are reused. Measured with tracemalloc.
+
+TOLERANCE_BYTES = 2048   # Interpreter noise (free lists, caches)
+PEAK_BYTES = 16 * 1024   # Temporary memory a batch of ticks or restarts may use
+
+
+@pytest.fixture
+def traced():
+    tracemalloc.start()
+    yield
+    tracemalloc.stop()
+
+
+# Bytes still allocated and peak bytes, over repeat calls of function
+def measure(function, repeat):
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    for _ in range(repeat):
+        function()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return current - before, peak - before
+
+
+@pytest.mark.parametrize("car_store", ["lanes", "list"])
+def test_steady_play_allocates_nothing(traced, car_store):
+    game = Game(seed=1, car_store=car_store)
+    for _ in range(1000):  # The chicken waits in the safe zone, cars keep moving
+        game.step()
+    created = game.car_pool.created
+    growth, peak = measure(game.step, 10000)
+    assert growth <= TOLERANCE_BYTES
+    assert peak <= PEAK_BYTES
+    assert game.car_pool.created == created
+
+
+@pytest.mark.parametrize("car_store", ["lanes", "list"])
+def test_restarts_reuse_cars(traced, car_store):
+    game = Game(seed=1, car_store=car_store)
+
+    def run():  # Run into a car, restart
+        game.step(Inputs(restart=True))
+        while not game.game_over:
+            game.step(Inputs(UP, release=True))
+
+    for _ in range(50):  # Fill the pool up to the largest layout
+        run()
+    created = game.car_pool.created
+    growth, peak = measure(run, 200)
+    assert growth <= TOLERANCE_BYTES
+    assert peak <= PEAK_BYTES
+    assert game.car_pool.created == created
+
+
+def test_refill_keeps_the_lane_lists():
+    cars = LaneIndexedCarList(generate_cars(random.Random(1)), GRID_SIZE)
+    lanes = dict(cars.lanes)
+    cars.refill(generate_cars(random.Random(2)))
+    assert all(cars.lanes[row] is lane for row, lane in lanes.items())
+    assert sum(len(lane) for lane in cars.lanes.values()) == len(cars)
+
+
+def test_legacy_reset_reuses_cars(traced):
+    game = legacy_game.Game(seed=1)
+
+    def all_cars():
+        return len(game.cars) + len(game.car_pool)
+
+    for _ in range(100):
+        game.reset()
+    count = all_cars()
+    growth, peak = measure(game.reset, 1000)
+    assert growth <= TOLERANCE_BYTES
+    assert peak <= PEAK_BYTES
+    assert all_cars() == count
@@ -0,0 +1,40 @@
+import json
+from batch_sim import summarize, run_episode, POLICIES
+from game_core import Difficulty
+
+
+def write(path, records):
+    with open(path, "w") as file:
+        for record in records:
+            file.write(json.dumps({"params": "p", "score": 0, "crossings": 0, **record}) + "\n")
+
+
+# Capped episodes count toward the capped share, not toward survival
+def test_summary_leaves_capped_episodes_out_of_survival(tmp_path):
+    path = tmp_path / "sweep.jsonl"
+    write(path, [{"seed": 0, "survival": 10.0, "died": True},
+                 {"seed": 1, "survival": 20.0, "died": True},
+                 {"seed": 2, "survival": 30.0, "died": True},
+                 {"seed": 3, "survival": 120.0, "died": False}])
+    entry = summarize(path)["p"]
+    assert entry["episodes"] == 4
+    assert entry["death_rate"] == 0.75
+    assert entry["capped_rate"] == 0.25
+    assert entry["mean_survival_s"] == 20.0
+    assert entry["median_survival_s"] == 20.0
+
+
+def test_summary_without_deaths(tmp_path):
+    path = tmp_path / "sweep.jsonl"
+    write(path, [{"seed": 0, "survival": 120.0, "died": False}])
+    entry = summarize(path)["p"]
+    assert entry["death_rate"] == 0 and entry["capped_rate"] == 1
+    assert entry["mean_survival_s"] is None and entry["median_survival_s"] is None
+
+
+def test_episodes_stop_at_death_or_cap():
+    for policy in POLICIES:
+        for seed in range(5):
+            result = run_episode(Difficulty(), policy, seed, max_ticks=300)
+            assert result["died"] or result["ticks"] == 300
+            assert result == run_episode(Difficulty(), policy, seed, max_ticks=300)
@@ -0,0 +1,53 @@
+import random
+import pytest
+from game_core import Game, Car, GRID_SIZE, WIDTH, generate_cars
+from car_store import make_car_store, CarList
+from test_game_core import SEEDS, play
+
+STORES = ["list", "lanes", "numpy"]
+
+
+def store(backend, cars):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    return make_car_store(cars, GRID_SIZE, backend)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("car_store", ["list", "numpy"])
+def test_car_stores_play_the_same(car_store, seed):
+    if car_store == "numpy":
+        pytest.importorskip("numpy")
+    assert play(Game(seed=seed, car_store=car_store), seed) == play(Game(seed=seed, car_store="lanes"), seed)
+
+
+@pytest.mark.parametrize("backend", STORES)
+def test_move_matches_car_move(backend):
+    cars = generate_cars(random.Random(3))
+    reference = [Car(car.x, car.y, car.width, car.speed, car.color) for car in cars]
+    cars = store(backend, cars)
+    for _ in range(500):
+        cars.move(WIDTH)
+        for car in reference:
+            car.move(WIDTH)
+        assert [(float(car.x), float(car.prev_x)) for car in cars] == [(car.x, car.prev_x) for car in reference]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("backend", ["lanes", "numpy"])
+def test_hits_match_list(backend, seed):
+    rng = random.Random(seed)
+    cars = generate_cars(random.Random(seed))
+    plain = CarList(Car(car.x, car.y, car.width, car.speed, car.color) for car in cars)
+    cars = store(backend, cars)
+    hits = 0
+    for _ in range(200):
+        cars.move(WIDTH)
+        plain.move(WIDTH)
+        for _ in range(10):
+            box = rng.uniform(-50, WIDTH), rng.uniform(-200, 700), GRID_SIZE * 0.9, GRID_SIZE * 0.9
+            expected = plain.hits(*box)
+            assert cars.hits(*box) == expected
+            hits += expected
+    assert hits > 0
+
@@ -0,0 +1,71 @@
+import random
+import pytest
+from game_core import Inputs, NO_INPUT, NOOP, DEFAULT_DIFFICULTY, GRID_SIZE, WIDTH, HEIGHT
+from endless import EndlessGame, ChunkRing, LaneChunk, CHUNK_ROWS
+from replay import ReplayRecorder, game_flags, load_replay, fast_forward
+from batch_sim import cautious_policy, DECISION_TICKS
+from test_game_core import SEEDS, play, state
+
+
+# A player that gets far enough up for the view to scroll
+def climb(game, ticks=6000):
+    rng = random.Random(game.seed)
+    for _ in range(ticks):
+        if game.tick % DECISION_TICKS == 0:
+            move = cautious_policy(game, rng)
+            yield Inputs(move, release=True, restart=True) if move != NOOP else Inputs(restart=True)
+        else:
+            yield NO_INPUT
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_same_seed_and_inputs_same_game(seed):
+    assert play(EndlessGame(seed=seed), seed) == play(EndlessGame(seed=seed), seed)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_replay_round_trip(tmp_path, seed):
+    game = EndlessGame(seed=seed)
+    recorder = ReplayRecorder(game.seed, game_flags(game))
+    for inputs in climb(game):
+        recorder.record(game.tick, inputs)
+        game.step(inputs)
+    recorder.save(tmp_path / "run.crr", game)
+    replay = load_replay(tmp_path / "run.crr")
+    replayed = fast_forward(replay)
+    assert type(replayed) is EndlessGame
+    assert replay.verify(replayed)
+    assert state(replayed) == state(game)
+
+
+def test_view_scrolls_and_reuses_cars():
+    game = EndlessGame(seed=1)
+    seen = set()
+    first_bottom = lowest_bottom = game.ring.bottom
+    for inputs in climb(game):
+        game.step(inputs)
+        lowest_bottom = min(lowest_bottom, game.ring.bottom)
+        seen.update(id(car) for car in game.cars)
+    assert lowest_bottom <= first_bottom - 2  # Chunks were recycled as the view scrolled
+    # The chunks' own Car objects, no new ones per refill
+    most_per_chunk = CHUNK_ROWS // 2 * DEFAULT_DIFFICULTY.num_cars[1]
+    assert len(seen) <= game.ring.size * most_per_chunk
+    assert sum(chunk.car_pool.created for chunk in game.ring.chunks) == len(seen)
+
+
+def test_chunk_is_the_same_whenever_made():
+    ring = ChunkRing(7, WIDTH, HEIGHT, DEFAULT_DIFFICULTY)
+    first = [(car.x, car.y, car.width, car.speed) for car in ring.chunk_at_row(0).cars]
+    ring.scroll(-10 * HEIGHT)
+    assert ring.chunk_at_row(0) is None
+    again = LaneChunk()
+    again.fill(0, random.Random("7:0"), WIDTH, ring.safe_zone_row, DEFAULT_DIFFICULTY)
+    assert [(car.x, car.y, car.width, car.speed) for car in again.cars] == first
+
+
+def test_hits_only_cars_in_the_box():
+    game = EndlessGame(seed=3)
+    for car in game.cars:
+        assert game.cars.hits(car.x + 1, car.y + 1, GRID_SIZE / 2, GRID_SIZE / 2)
+    assert not game.cars.hits(0, game.player.y, WIDTH, GRID_SIZE * 0.9)  # Safe zone
+
@@ -0,0 +1,96 @@
+import random
+import pytest
+from game_core import NOOP, UP, DOWN, LEFT, RIGHT, Difficulty
+
+np = pytest.importorskip("numpy")
+from env import CrossyEnv, VectorCrossyEnv, PLAYER, NUM_ACTIONS  # noqa: E402
+
+SEEDS = list(range(40))
+ACTIONS = (UP, UP, UP, NOOP, DOWN, LEFT, RIGHT)
+
+
+# Each game of a VectorCrossyEnv is loaded with the layout of the
+# CrossyEnv with the same seed, then both are stepped with the same
+# actions until the game ends
+@pytest.mark.parametrize("difficulty", [Difficulty(), Difficulty(num_cars=(3, 4), speed=(4, 6))])
+def test_vector_env_matches_single_env(difficulty):
+    singles = [CrossyEnv(difficulty, max_steps=1500) for _ in SEEDS]
+    vector = VectorCrossyEnv(len(SEEDS), seed=0, difficulty=difficulty, max_steps=1500)
+    vector.reset()
+    observations = []
+    for env, (single, seed) in enumerate(zip(singles, SEEDS)):
+        observations.append(single.reset(seed))
+        vector.load_cars(env, single.game.cars)
+    assert np.array_equal(vector.observe(), np.array(observations))
+
+    rng = random.Random(0)
+    running = np.ones(len(SEEDS), dtype=bool)
+    collisions = 0
+    while running.any():
+        actions = [rng.choice(ACTIONS) for _ in SEEDS]
+        obs, reward, done, info = vector.step(actions)
+        for env in np.flatnonzero(running):
+            single_obs, single_reward, single_done, single_info = singles[env].step(actions[env])
+            assert reward[env] == single_reward
+            assert done[env] == single_done
+            assert info["score"][env] == single_info["score"]
+            assert info["collision"][env] == single_info["collision"]
+            if single_done:
+                # The vector game already started again on a new layout
+                running[env] = False
+                collisions += single_info["collision"]
+            else:
+                assert np.array_equal(obs[env], single_obs)
+    assert collisions > len(SEEDS) // 2  # Not only step capped games
+
+
+def test_same_seed_same_games():
+    first = VectorCrossyEnv(8, seed=3)
+    second = VectorCrossyEnv(8, seed=3)
+    assert np.array_equal(first.reset(), second.reset())
+    rng = random.Random(1)
+    for _ in range(300):
+        actions = [rng.randrange(NUM_ACTIONS) for _ in range(8)]
+        for a, b in zip(first.step(actions)[:3], second.step(actions)[:3]):
+            assert np.array_equal(a, b)
+    assert np.array_equal(first.reset(seed=5), VectorCrossyEnv(8, seed=5).reset())
+
+
+# Finished games (collision or step cap) start again inside step(), while
+# info still reports how the finished game ended
+def test_finished_games_start_again():
+    vector = VectorCrossyEnv(16, seed=2, max_steps=30)
+    vector.reset()
+    finished = np.zeros(16, dtype=bool)
+    for step in range(30):
+        layouts = vector.car_x.copy()
+        score = vector.score.copy()
+        obs, reward, done, info = vector.step([UP if step == 0 else NOOP] * 16)
+        assert np.array_equal(info["score"], score + reward)
+        for env in np.flatnonzero(done):
+            assert vector.steps[env] == 0 and vector.score[env] == 0
+            assert vector.player_x[env] == vector.start_x
+            assert vector.player_y[env] == vector.start_y
+            assert not np.array_equal(vector.car_x[env], layouts[env])
+            assert (obs[env] == PLAYER).sum() == 1
+        unfinished = ~done & ~finished
+        assert np.all(vector.steps[unfinished] == step + 1)
+        finished |= done
+    # Standing still on the grass only ends by the step cap
+    assert finished.all() and not info["collision"].all()
+
+
+def test_single_env_reset():
+    single = CrossyEnv(max_steps=20)
+    first = single.reset(seed=4)
+    assert np.array_equal(CrossyEnv().reset(seed=4), first)
+    run_seed = single.game.run_seed
+    for _ in range(20):
+        obs, reward, done, info = single.step(UP)
+        if done:
+            break
+    assert done
+    single.reset()  # Next run of the same game
+    assert single.steps == 0 and single.game.score == 0 and not single.game.game_over
+    assert single.game.run_seed != run_seed
+    assert np.array_equal(single.reset(seed=4), first)
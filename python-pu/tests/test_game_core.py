@@ -0,0 +1,48 @@
+import random
+import pytest
+from game_core import Game, Inputs, NO_INPUT, NOOP, UP, DOWN, LEFT, RIGHT
+
+SEEDS = [1, 7, 2024]
+
+
+# Inputs of a player that mostly goes up and restarts after dying
+def scripted_inputs(seed, ticks):
+    rng = random.Random(seed)
+    for tick in range(ticks):
+        if tick % 4:
+            yield NO_INPUT
+        else:
+            move = rng.choice((UP, UP, UP, DOWN, LEFT, RIGHT, NOOP))
+            yield Inputs(move, release=True, restart=rng.random() < 0.1)
+
+
+def state(game):
+    player = game.player
+    return (game.tick, game.score, game.game_over, game.run_seed, game.crossings,
+            game.sim_speed, player.x, player.y, [(float(car.x), float(car.y)) for car in game.cars])
+
+
+def play(game, seed, ticks=3000):
+    states = []
+    for inputs in scripted_inputs(seed, ticks):
+        game.step(inputs)
+        states.append(state(game))
+    return states
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_same_seed_and_inputs_same_game(seed):
+    assert play(Game(seed=seed), seed) == play(Game(seed=seed), seed)
+
+
+def test_seeds_give_different_layouts():
+    layouts = {tuple(state(Game(seed=seed))[-1]) for seed in SEEDS}
+    assert len(layouts) == len(SEEDS)
+
+
+def test_inputs_are_played():
+    game = Game(seed=1)
+    states = play(game, 1)
+    assert game.moves > 0
+    assert any(s[2] for s in states)  # Died at least once
+    assert max(s[1] for s in states) > 0
@@ -0,0 +1,90 @@
+import os
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("SDL_RENDER_DRIVER", "software")
+pygame = pytest.importorskip("pygame")
+from game_core import Game, Inputs, NO_INPUT, UP, LEFT  # noqa: E402
+from profiler import FrameProfiler  # noqa: E402
+from renderer import Renderer  # noqa: E402
+
+SIZE = (400, 400)
+# Both draw the same sprites; SDL's renderer and pygame's blits round
+# alpha blending (antialiased text edges) a little differently
+TOLERANCE = 8               # Per channel, 0-255
+MAX_MEAN_DIFFERENCE = 0.5   # Per channel, 0-255
+MAX_DIFFERENT_PIXELS = 0.001
+
+
+# pygame stays initialized: hud keeps its fonts for the whole process
+@pytest.fixture(scope="module")
+def windows():
+    pygame.init()
+    screen = pygame.display.set_mode(SIZE)
+    gpu_render = pytest.importorskip("gpu_render")
+    return screen, gpu_render
+
+
+def differences(first, second):
+    first = pygame.image.tobytes(first, "RGB")
+    second = pygame.image.tobytes(second, "RGB")
+    channels = list(zip(first, second))
+    pixels = [channels[i:i + 3] for i in range(0, len(channels), 3)]
+    mean = sum(abs(a - b) for a, b in channels) / len(channels)
+    different = sum(1 for pixel in pixels if any(abs(a - b) > TOLERANCE for a, b in pixel)) / len(pixels)
+    return mean, different
+
+
+def play(game, ticks):
+    for tick in range(ticks):
+        if tick % 10 == 0:
+            game.step(Inputs(UP if tick % 20 == 0 else LEFT, release=True))
+        else:
+            game.step(NO_INPUT)
+
+
+@pytest.mark.parametrize("scrolls", [False, True])
+def test_gpu_frame_matches_software_frame(windows, scrolls):
+    screen, gpu_render = windows
+    if scrolls:
+        from endless import EndlessGame
+        game = EndlessGame(seed=5, world_width=SIZE[0], world_height=SIZE[1])
+    else:
+        game = Game(seed=5, world_width=SIZE[0], world_height=SIZE[1])
+    software = Renderer(screen, game, dirty_rects=False)
+    gpu = gpu_render.open_gpu_renderer("test", SIZE, game)
+    try:
+        for _ in range(4):
+            play(game, 37)
+            software.draw(game, 0.5)
+            gpu.draw(game, 0.5)
+            mean, different = differences(screen, gpu.to_surface())
+            assert mean <= MAX_MEAN_DIFFERENCE
+            assert different <= MAX_DIFFERENT_PIXELS
+    finally:
+        gpu.window.destroy()
+
+
+def test_profiler_overlay_reuses_its_texture(windows):
+    screen, gpu_render = windows
+    game = Game(seed=5, world_width=SIZE[0], world_height=SIZE[1])
+    profiler = FrameProfiler(60)
+    gpu = gpu_render.open_gpu_renderer("test", SIZE, game, profiler=profiler)
+    try:
+        gpu.profiler_overlay.toggle()
+        textures = set()
+        for _ in range(20):
+            profiler.begin_frame()
+            play(game, 3)
+            gpu.draw(game)
+            profiler.end_frame()
+            textures.add(id(gpu.overlay_texture))
+        assert len(textures) == 1
+        # The panel shows up over the lanes
+        panel = gpu.profiler_overlay.position
+        without = Renderer(screen, game, dirty_rects=False)
+        without.draw(game)
+        assert gpu.to_surface().get_at(panel) != screen.get_at(panel)
+    finally:
+        gpu.window.destroy()
@@ -0,0 +1,93 @@
+import os
+import time
+import pytest
+import highscore
+from highscore import load_high_score, save_high_score, HighScoreWriter
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "highscore.txt"
+    assert load_high_score(path) == 0  # No file yet
+    save_high_score(42, path)
+    assert load_high_score(path) == 42
+    save_high_score(43, path)
+    assert load_high_score(path) == 43
+
+
+def test_unreadable_files_load_as_zero(tmp_path):
+    corrupt = tmp_path / "corrupt.txt"
+    corrupt.write_bytes(b"\xff\xfe not a number")
+    assert load_high_score(corrupt) == 0
+    assert load_high_score(tmp_path) == 0  # A directory
+
+
+# A save that fails at any point leaves the old file as it was and no
+# temporary file behind
+@pytest.mark.parametrize("failing", ["fsync", "replace"])
+def test_failed_save_keeps_the_old_file(tmp_path, monkeypatch, failing):
+    path = tmp_path / "highscore.txt"
+    save_high_score(5, path)
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(highscore.os, failing, fail)
+    with pytest.raises(OSError):
+        save_high_score(6, path)
+    monkeypatch.undo()
+    assert path.read_text() == "5"
+    assert os.listdir(tmp_path) == ["highscore.txt"]
+
+
+# Scores submitted between writes are written once, the best of them
+def test_writer_coalesces_submits(tmp_path):
+    path = tmp_path / "highscore.txt"
+    writer = HighScoreWriter(path, interval=60)
+    try:
+        for score in (3, 9, 7):
+            writer.submit(score)
+        assert not path.exists() and writer.writes == 0  # Nothing written from the game thread
+        writer.flush_soon()
+        wait_for(lambda: writer.writes == 1)
+        assert load_high_score(path) == 9
+        writer.flush()  # Nothing pending
+        assert writer.writes == 1
+        writer.submit(12)
+        writer.flush()
+        assert writer.writes == 2 and load_high_score(path) == 12
+    finally:
+        writer.close()
+
+
+def test_close_writes_what_is_pending(tmp_path):
+    path = tmp_path / "highscore.txt"
+    writer = HighScoreWriter(path, interval=60)
+    writer.submit(21)
+    writer.close()
+    assert load_high_score(path) == 21
+    assert not writer.thread.is_alive()
+
+
+# A failed write keeps the score for the next one; close() reports it
+def test_failed_write_is_retried(tmp_path, capsys):
+    path = tmp_path / "missing" / "highscore.txt"
+    writer = HighScoreWriter(path, interval=60)
+    writer.submit(8)
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.pending == 8 and writer.writes == 0
+    writer.submit(4)  # Lower scores don't replace it
+    (tmp_path / "missing").mkdir()
+    writer.flush()
+    assert load_high_score(path) == 8 and writer.writes == 1
+
+    writer.path = tmp_path / "gone" / "highscore.txt"
+    writer.submit(10)
+    writer.close()  # Doesn't raise
+    assert "Can't save the high score" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+import pytest
+from game_core import Game, UP, DOWN, LEFT, RIGHT, GRID_SIZE
+
+pygame = pytest.importorskip("pygame")
+from input_queue import InputQueue, PolledInput  # noqa: E402
+from profiler import FrameProfiler  # noqa: E402
+
+MOVE_KEYS = [(pygame.K_w, UP), (pygame.K_s, DOWN), (pygame.K_a, LEFT), (pygame.K_d, RIGHT)]
+NOTHING_PRESSED = {key: False for key, _ in MOVE_KEYS}
+
+
+# One frame of the game loop: the events read, a poll, then some ticks
+def frame(player_input, game, events=(), ticks=3, pressed=None):
+    for kind, key, read_time in events:
+        if kind == "down":
+            player_input.key_down(key, read_time)
+        else:
+            player_input.key_up(key)
+    if pressed is None:
+        player_input.poll(game)
+    else:
+        player_input.poll(game, pressed)
+    for _ in range(ticks):
+        moves = game.moves
+        game.step(player_input.next_input())
+        if game.moves != moves:
+            player_input.moved()
+
+
+# A tap that goes down and up between two polls moves exactly once
+def test_tap_between_polls_moves_once():
+    game = Game(seed=1)
+    queue = InputQueue(MOVE_KEYS)
+    y = game.player.y
+    frame(queue, game, [("down", pygame.K_w, 0.0), ("up", pygame.K_w, 0.0)])
+    for _ in range(5):
+        frame(queue, game)
+    assert game.moves == 1 and game.player.y == y - GRID_SIZE
+    assert queue.lost == 0
+
+
+def test_two_taps_move_twice():
+    game = Game(seed=1)
+    queue = InputQueue(MOVE_KEYS)
+    x = game.player.x
+    taps = [("down", pygame.K_a, 0.0), ("up", pygame.K_a, 0.0)] * 2
+    frame(queue, game, taps, ticks=1)
+    frame(queue, game, ticks=1)
+    assert game.moves == 2 and game.player.x == x - 2 * GRID_SIZE
+
+
+# The polled input only sees keys held at the poll: the same tap is lost
+def test_polled_input_misses_the_tap():
+    game = Game(seed=1)
+    polled = PolledInput(MOVE_KEYS)
+    frame(polled, game, [("down", pygame.K_w, 0.0), ("up", pygame.K_w, 0.0)], pressed=NOTHING_PRESSED)
+    assert game.moves == 0 and polled.lost == 1
+
+
+# Presses beyond the bound are dropped and counted; the rest all move
+def test_queue_bound_counts_dropped_presses():
+    game = Game(seed=1)
+    queue = InputQueue(MOVE_KEYS, max_moves=4)
+    taps = [("down", key, 0.0) for key in (pygame.K_a, pygame.K_d) * 3]
+    frame(queue, game, taps, ticks=0)
+    assert len(queue.moves) == 4
+    assert queue.dropped == 2 and queue.lost == 2
+    frame(queue, game, ticks=6)
+    assert game.moves == 4 and not queue.moves
+
+
+def test_game_over_forgets_queued_presses():
+    game = Game(seed=1)
+    queue = InputQueue(MOVE_KEYS)
+    game.game_over = True
+    frame(queue, game, [("down", pygame.K_w, 0.0), ("down", pygame.K_w, 0.0)], ticks=0)
+    assert not queue.moves and queue.lost == 2
+
+
+# Latency runs from reading the press to presenting the frame that shows it
+def test_latency_is_measured_to_the_presented_frame():
+    profiler = FrameProfiler(60)
+    game = Game(seed=1)
+    queue = InputQueue(MOVE_KEYS, profiler)
+    frame(queue, game, [("down", pygame.K_w, 1.0), ("down", pygame.K_d, 1.0)], ticks=1)
+    queue.presented(1.05)
+    frame(queue, game, ticks=1)
+    queue.presented(1.1)
+    assert [round(sample, 6) for sample in profiler.latencies] == [0.05, 0.1]
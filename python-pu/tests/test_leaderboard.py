@@ -0,0 +1,84 @@
+import os
+import time
+from datetime import datetime
+from leaderboard import Leaderboard, day_of
+from highscore import save_high_score
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def open_board(tmp_path, legacy_score=None):
+    legacy_path = tmp_path / "highscore.txt"
+    if legacy_score is not None:
+        save_high_score(legacy_score, legacy_path)
+    return Leaderboard(tmp_path / "leaderboard.db", legacy_path=legacy_path)
+
+
+# The record of highscore.txt becomes a run, once
+def test_imports_the_legacy_high_score_once(tmp_path):
+    board = open_board(tmp_path, legacy_score=50)
+    mtime = os.path.getmtime(tmp_path / "highscore.txt")
+    assert board.high_score() == 50 and board.run_count() == 1
+    assert board.top() == [(50, None, None, None, mtime)]
+    board.close()
+
+    save_high_score(70, tmp_path / "highscore.txt")
+    board = open_board(tmp_path)
+    assert board.high_score() == 50 and board.run_count() == 1
+    board.close()
+
+
+def test_no_legacy_high_score(tmp_path):
+    board = open_board(tmp_path)
+    assert board.high_score() == 0 and board.run_count() == 0 and board.top() == []
+    assert board.rank(0) == 1
+    board.close()
+
+
+def test_runs_are_written_in_the_background(tmp_path):
+    board = open_board(tmp_path)
+    try:
+        board.record_run(12, 45, 30.5, 1234)
+        wait_for(lambda: board.run_count() == 1)  # record_run wakes the writer
+        assert [run[:4] for run in board.top()] == [(12, 45, 30.5, 1234)]
+        assert not board.pending
+    finally:
+        board.close()
+
+
+def test_close_writes_pending_runs(tmp_path):
+    board = open_board(tmp_path)
+    # Stop the writer thread first, so the runs are still pending at close()
+    board.stopped = True
+    board.wake.set()
+    board.thread.join()
+    for score in (3, 1, 2):
+        board.record_run(score, 30, 10.0, score)
+    assert board.pending
+    board.close()
+    board = open_board(tmp_path)
+    assert [run[0] for run in board.top()] == [3, 2, 1]
+    board.close()
+
+
+def test_top_and_rank(tmp_path):
+    board = open_board(tmp_path)
+    first_day = datetime(2024, 5, 1, 12).timestamp()
+    second_day = datetime(2024, 5, 2, 12).timestamp()
+    for score, finished_at in ((10, first_day), (20, first_day), (20, second_day), (30, second_day)):
+        board.record_run(score, 30, 5.0, score, finished_at)
+    board.flush()
+    assert board.run_count() == 4
+    assert [run[0] for run in board.top()] == [30, 20, 20, 10]
+    assert [run[0] for run in board.top(2)] == [30, 20]
+    assert [run[0] for run in board.top(day=day_of(first_day))] == [20, 10]
+    assert [run[0] for run in board.top(day=day_of(second_day))] == [30, 20]
+    assert day_of(first_day) == 20240501
+    # Runs with a higher score, plus one
+    assert [board.rank(score) for score in (40, 30, 25, 20, 15, 10, 5)] == [1, 1, 2, 2, 4, 4, 5]
+    board.close()
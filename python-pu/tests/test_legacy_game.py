@@ -0,0 +1,99 @@
+import importlib.util
+import os
+import random
+import pytest
+from game_core import Inputs, NO_INPUT, NOOP, UP, DOWN, LEFT, RIGHT
+from legacy_game import Game, Car, GRID_SIZE, SAFE_AREA_HEIGHT, WIDTH, HEIGHT
+
+GAME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def play(game, seed, frames=2000):
+    rng = random.Random(seed)
+    for _ in range(frames):
+        move = rng.choice((NOOP, NOOP, UP, UP, DOWN, LEFT, RIGHT))
+        game.step(Inputs(move, restart=rng.random() < 0.05))
+        yield game.score, game.game_over, game.player.x, game.player.y, [(car.x, car.y) for car in game.cars]
+
+
+def test_same_seed_same_game():
+    for seed in (1, 7, 2024):
+        assert list(play(Game(seed), seed)) == list(play(Game(seed), seed))
+    assert list(play(Game(1), 1)) != list(play(Game(2), 1))
+
+
+def test_moves_stay_on_screen():
+    game = Game(1)
+    game.cars.clear()
+    start = (game.player.x, game.player.y)
+    game.step(Inputs(DOWN))
+    assert (game.player.x, game.player.y) == (start[0], start[1] + GRID_SIZE)
+    game.step(Inputs(DOWN))  # At the bottom edge
+    assert game.player.y == start[1] + GRID_SIZE
+    for _ in range(20):
+        game.step(Inputs(RIGHT))
+    assert game.player.x == WIDTH - GRID_SIZE
+
+
+def test_crossing_scores():
+    game = Game(1)
+    game.cars.clear()
+    start_y = game.player.y
+    for _ in range(20):
+        game.step(Inputs(UP))
+        if game.player.y == start_y:
+            break
+    # A point for each of the 7 rows from 320 up to 80, 10 for the grass
+    assert game.player.y == start_y
+    assert game.score == 7 + 10
+
+
+def test_collision_ends_the_game_until_restart():
+    game = Game(1)
+    car = Car(game.player.y, 2, random.Random(1))
+    car.x = game.player.x - car.width + 1 - car.speed  # Touches the player after its move
+    game.cars[:] = [car]
+    game.step(NO_INPUT)
+    assert game.game_over
+    x = car.x
+    game.step(Inputs(LEFT))
+    assert game.game_over and car.x == x  # Cars stop, the player still moves
+    game.step(Inputs(restart=True))
+    assert not game.game_over and game.score == 0
+    assert game.player.y == HEIGHT - GRID_SIZE * 2
+
+
+def test_reset_reuses_cars():
+    game = Game(1)
+    cars = game.cars
+    seen = {id(car) for car in cars}
+    for _ in range(50):
+        game.reset()
+        seen.update(id(car) for car in cars)
+    assert game.cars is cars
+    assert len(seen) <= 10  # At most two cars in each of the five lanes
+
+
+# The drawing helpers of the script take what they draw as arguments,
+# so importing it and calling them needs no main block
+def test_script_draws_when_imported():
+    pygame = pytest.importorskip("pygame")
+    spec = importlib.util.spec_from_file_location("crossy_legacy", os.path.join(GAME_DIR, "import pygame.py"))
+    legacy = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(legacy)
+    pygame.font.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    game = Game(1)
+    safe_area = pygame.Rect(0, 0, WIDTH, SAFE_AREA_HEIGHT)
+    grass_textures = legacy.GrassTextures(safe_area.size, legacy.GREEN, legacy.DARK_GREEN, legacy.GRASS_SEED,
+                                          legacy.GRASS_VARIANTS, legacy.GRASS_SHIMMER_FRAMES)
+    score_label = legacy.CachedText(legacy.get_font('Arial', 28, bold=True), "Score: {}")
+    screen.fill(legacy.DARK_GREEN)
+    legacy.draw_road(screen)
+    legacy.draw_grass_area(screen, grass_textures, safe_area)
+    for car in game.cars:
+        legacy.draw_car(screen, car)
+    legacy.draw_player(screen, game.player)
+    legacy.draw_score(screen, score_label, game.score)
+    assert screen.get_at((0, HEIGHT - GRID_SIZE * 3 + 1))[:3] == legacy.GRAY
+    assert screen.get_at((game.player.x + GRID_SIZE // 2, game.player.y + GRID_SIZE // 2))[:3] == legacy.WHITE
@@ -0,0 +1,132 @@
+import copy
+import random
+import pytest
+from game_core import Player, Car, Difficulty, GRID_SIZE, NOOP, UP, DOWN, LEFT, RIGHT, generate_cars
+from car_store import CarList
+
+pytest.importorskip("numpy")
+from levelgen import LevelChecker, make_solvable  # noqa: E402
+
+# A small world keeps the brute force search quick: rows 0-4 can have
+# cars, 5-6 are the safe zone and the player starts in row 6
+WORLD = 400, 320
+STEPS = 60
+HARD = Difficulty(num_cars=(3, 5), speed=(2, 5), car_width=(80, 140))
+
+
+def checker():
+    return LevelChecker(*WORLD, horizon_steps=STEPS)
+
+
+# The crossing search again, tick by tick: every position the player can
+# be in after each move, using Player.move for the sideways wrap and the
+# cars' own moves and overlap test. Returns the step at which the top
+# row is reached, or None.
+class BruteForce:
+    def __init__(self, interval):
+        self.player = Player(*WORLD)
+        self.rows = int(self.player.bottom // GRID_SIZE) + 1
+        self.start = int(self.player.y // GRID_SIZE), self.player.x
+        self.interval = interval
+
+    def sideways(self, x, dx):
+        player = self.player
+        player.x, player.y, player.can_move = x, player.bottom, True
+        player.move(dx, 0)
+        return player.x
+
+    def moves(self, row, x):
+        yield NOOP, (row, x)
+        if row > 0:
+            yield UP, (row - 1, x)
+        yield DOWN, (min(row + 1, self.rows - 1), x)
+        yield LEFT, (row, self.sideways(x, -1))
+        yield RIGHT, (row, self.sideways(x, 1))
+
+    # Ticks of one step; positions a car touches are dropped
+    def advance(self, cars, positions):
+        size = self.player.width
+        for _ in range(self.interval):
+            cars.move(WORLD[0])
+            positions = {(row, x) for row, x in positions if not cars.hits(x, row * GRID_SIZE, size, size)}
+        return positions
+
+    def steps(self, cars):
+        cars = CarList(copy.deepcopy(cars))
+        reach = {self.start}
+        for step in range(STEPS):
+            if any(row == 0 for row, _ in reach):
+                return step
+            reach = self.advance(cars, {to for row, x in reach for _, to in self.moves(row, x)})
+            if not reach:
+                return None
+        return None
+
+    # Plays moves (one per step); True when they end through the portal
+    # without a car touching the player
+    def crosses(self, cars, path):
+        cars = CarList(copy.deepcopy(cars))
+        row, x = self.start
+        for action in path[:-1]:
+            row, x = dict(self.moves(row, x))[action]
+            if not self.advance(cars, {(row, x)}):
+                return False
+        return path[-1] == UP and row == 0
+
+
+# Cars standing still over the whole row: nobody gets past it
+def wall(row):
+    return [Car(-10, row * GRID_SIZE + 2, 210, 0, (0, 0, 0)), Car(190, row * GRID_SIZE + 2, 220, 0, (0, 0, 0))]
+
+
+def test_empty_road_is_straight_up():
+    level = checker()
+    assert level.search([])[0] == level.rows - 1
+    assert level.find_path([]) == [UP] * level.rows
+
+
+def test_wall_is_not_solvable():
+    level = checker()
+    steps, best_row, _ = level.search(wall(3))
+    assert steps is None
+    assert best_row == 4
+    assert level.find_path(wall(3)) is None
+    assert BruteForce(level.interval).steps(wall(3)) is None
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_search_matches_brute_force(seed):
+    level = checker()
+    cars = generate_cars(random.Random(seed), *WORLD, HARD)
+    steps = level.search(cars)[0]
+    assert steps == BruteForce(level.interval).steps(cars)
+    assert level.solvable(cars) == (steps is not None)
+
+
+def test_random_layouts_are_both_kinds():
+    level = checker()
+    results = {level.solvable(generate_cars(random.Random(seed), *WORLD, HARD)) for seed in range(12)}
+    assert results == {True, False}
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_find_path_crosses(seed):
+    level = checker()
+    cars = generate_cars(random.Random(seed), *WORLD, HARD)
+    path = level.find_path(cars)
+    if path is None:
+        assert not level.solvable(cars)
+    else:
+        assert len(path) == level.search(cars)[0] + 1
+        assert BruteForce(level.interval).crosses(cars, path)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_make_solvable_repairs_a_wall(seed):
+    level = checker()
+    cars = generate_cars(random.Random(seed), *WORLD) + wall(3)
+    assert not level.solvable(cars)
+    repairs, solvable = make_solvable(cars, random.Random(seed), level)
+    assert solvable
+    assert repairs > 0
+    assert BruteForce(level.interval).steps(cars) is not None
@@ -0,0 +1,152 @@
+import copy
+import random
+import pytest
+from game_core import Game, Car, CarPool, GRID_SIZE, WIDTH, generate_cars
+from car_store import CarList
+from predict import CarMotion, LanePredictor, VECTOR_MIN_CARS
+
+SEEDS = [1, 7, 2024, 99]
+HORIZON = 600  # Ticks simulated for the brute force answers
+
+
+# First tick in [tick, HORIZON) at which a car overlaps the box, moving
+# the cars one tick at a time; None if none does
+def brute_next_hit(cars, x, y, width, height, tick):
+    cars = CarList(copy.deepcopy(cars))
+    for moves in range(HORIZON):
+        if moves >= tick and cars.hits(x, y, width, height):
+            return moves
+        cars.move(WIDTH)
+    return None
+
+
+# Whether a car overlaps the box, for each tick in [0, HORIZON)
+def brute_overlaps(cars, x, y, width, height):
+    cars = CarList(copy.deepcopy(cars))
+    overlaps = []
+    for _ in range(HORIZON):
+        overlaps.append(cars.hits(x, y, width, height))
+        cars.move(WIDTH)
+    return overlaps
+
+
+# Half-open runs of ticks in [tick, end) without an overlap
+def free_runs(overlaps, tick, end):
+    runs = []
+    start = None
+    for moves in range(tick, end):
+        if not overlaps[moves] and start is None:
+            start = moves
+        elif overlaps[moves] and start is not None:
+            runs.append((start, moves))
+            start = None
+    if start is not None:
+        runs.append((start, end))
+    return runs
+
+
+def clipped(hit):
+    return hit if hit is not None and hit < HORIZON else None
+
+
+# Player-sized boxes on every road row plus a grass row, at random x
+def query_boxes(rng, rows):
+    size = GRID_SIZE * 0.9
+    for row in rows:
+        for _ in range(3):
+            yield rng.uniform(-GRID_SIZE, WIDTH), row * GRID_SIZE, size, size
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_x_at_matches_car_move(seed):
+    rng = random.Random(seed)
+    for _ in range(20):
+        speed = rng.choice((-5, -3, -2, 0, 2, 4, 5))
+        car = Car(rng.uniform(-120, WIDTH + 10), 2, rng.randint(80, 120), speed, (0, 0, 0))
+        motion = CarMotion(car, WIDTH)
+        for tick in range(HORIZON):
+            assert motion.x_at(tick) == pytest.approx(car.x)
+            car.move(WIDTH)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_next_hit_matches_brute_force(seed):
+    rng = random.Random(seed)
+    cars = generate_cars(random.Random(seed))
+    predictor = LanePredictor(cars, WIDTH, GRID_SIZE)
+    for x, y, width, height in query_boxes(rng, range(-1, 16)):
+        tick = rng.randrange(0, 200)
+        expected = brute_next_hit(cars, x, y, width, height, tick)
+        assert clipped(predictor.next_hit(x, y, width, height, tick)) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_time_to_hit_matches_brute_force(seed):
+    rng = random.Random(seed)
+    cars = generate_cars(random.Random(seed))
+    predictor = LanePredictor(cars, WIDTH, GRID_SIZE)
+    for x, y, width, height in query_boxes(rng, range(1, 16, 2)):
+        tick = rng.randrange(0, 200)
+        expected = brute_next_hit(cars, x, y, width, height, tick)
+        ticks = predictor.time_to_hit(x, y, width, height, tick)
+        assert clipped(None if ticks is None else tick + ticks) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_safe_windows_match_brute_force(seed):
+    rng = random.Random(seed)
+    cars = generate_cars(random.Random(seed))
+    predictor = LanePredictor(cars, WIDTH, GRID_SIZE)
+    windows = 0
+    for x, y, width, height in query_boxes(rng, range(-1, 16)):
+        tick = rng.randrange(0, 200)
+        horizon = rng.randrange(1, HORIZON - tick)
+        overlaps = brute_overlaps(cars, x, y, width, height)
+        expected = free_runs(overlaps, tick, tick + horizon)
+        assert predictor.safe_windows(x, y, width, height, tick, horizon) == expected
+        windows += len(expected)
+    assert windows > 0
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_hit_ranges_match_brute_force(seed):
+    rng = random.Random(seed)
+    for _ in range(30):
+        speed = rng.choice((-5, -3, -2, 0, 2, 4, 5))
+        car = Car(rng.uniform(-120, WIDTH + 10), 2, rng.randint(80, 120), speed, (0, 0, 0))
+        motion = CarMotion(car, WIDTH)
+        x = rng.uniform(-GRID_SIZE, WIDTH)
+        tick = rng.randrange(0, 200)
+        end = rng.randrange(tick + 1, HORIZON)
+        overlaps = brute_overlaps([car], x, 0, GRID_SIZE * 0.9, GRID_SIZE * 0.9)
+        hit = set()
+        for a, b in motion.hit_ranges(x, GRID_SIZE * 0.9, tick, end):
+            assert tick <= a < b <= end
+            hit.update(range(a, b))
+        assert hit == {moves for moves in range(tick, end) if overlaps[moves]}
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_vector_lanes_match_brute_force(seed):
+    pytest.importorskip("numpy")
+    rng = random.Random(seed)
+    pool = CarPool()
+    cars = []
+    for row in (1, 3):
+        speed = rng.choice((-5, -2, 3, 4))
+        for _ in range(VECTOR_MIN_CARS):
+            cars.append(pool.acquire(rng.uniform(-100, WIDTH), row * GRID_SIZE + 2,
+                                     rng.randint(10, 40), speed, (0, 0, 0)))
+    predictor = LanePredictor(cars, WIDTH, GRID_SIZE)
+    assert set(predictor.vector_lanes) == {1, 3}
+    for x, y, width, height in query_boxes(rng, (1, 3)):
+        tick = rng.randrange(0, 200)
+        expected = brute_next_hit(cars, x, y, width, height, tick)
+        assert clipped(predictor.next_hit(x, y, width, height, tick)) == expected
+
+
+# Predicted collisions end runs on exactly the ticks tested ones do
+@pytest.mark.parametrize("seed", SEEDS)
+def test_predicted_collisions_play_like_tested(seed):
+    from test_game_core import play
+    assert play(Game(seed=seed, collision="predict"), seed) == play(Game(seed=seed), seed)
@@ -0,0 +1,74 @@
+import random
+from quality import (QualityController, QUALITY_LEVELS, SAMPLE_FRAMES, UP_FRAMES, HEADROOM,
+                     COOLDOWN_FRAMES)
+
+BUDGET_MS = 10.0
+
+
+# Feeds work_ms(level) for a number of frames; returns the frames at
+# which the level changed, with the new level
+def run(controller, work_ms, frames):
+    changes = []
+    for frame in range(frames):
+        if controller.update(work_ms(controller.level)):
+            changes.append((frame, controller.level))
+    return changes
+
+
+def test_steps_down_when_frames_keep_missing_the_budget():
+    levels = []
+    controller = QualityController(BUDGET_MS, levels.append)
+    changes = run(controller, lambda level: BUDGET_MS * 1.2, SAMPLE_FRAMES + COOLDOWN_FRAMES)
+    # Down after one full window of samples, then nothing during the cooldown
+    assert changes == [(SAMPLE_FRAMES - 1, 1)]
+    assert levels == [QUALITY_LEVELS[1]] and controller.current == QUALITY_LEVELS[1]
+
+
+def test_single_spikes_do_not_step_down():
+    controller = QualityController(BUDGET_MS)
+    frames = iter(range(5000))
+    work = lambda level: BUDGET_MS * 3 if next(frames) % 100 == 0 else BUDGET_MS * 0.7  # noqa: E731
+    assert run(controller, work, 5000) == []
+
+
+def test_stops_at_the_lowest_level():
+    controller = QualityController(BUDGET_MS)
+    run(controller, lambda level: BUDGET_MS * 3, 5000)
+    assert controller.level == len(QUALITY_LEVELS) - 1
+    assert controller.changes == len(QUALITY_LEVELS) - 1
+
+
+# Work just over the budget at one level and just under it at the next,
+# with noise across the threshold: one step down, then it stays
+def test_no_oscillation_near_the_threshold():
+    rng = random.Random(2)
+    costs = [BUDGET_MS * 1.02, BUDGET_MS * 0.9, BUDGET_MS * 0.8, BUDGET_MS * 0.7, BUDGET_MS * 0.6]
+
+    def work(level):
+        return costs[level] * rng.uniform(0.9, 1.1)
+    controller = QualityController(BUDGET_MS)
+    changes = run(controller, work, 20000)
+    assert [level for _, level in changes] == [1]
+
+
+def test_steps_back_up_after_a_long_stretch_of_headroom():
+    controller = QualityController(BUDGET_MS)
+    controller.set_level(2)
+    work = lambda level: BUDGET_MS * HEADROOM * 0.5  # noqa: E731
+    changes = run(controller, work, 2 * (COOLDOWN_FRAMES + UP_FRAMES))
+    assert changes == [(COOLDOWN_FRAMES + UP_FRAMES - 1, 1),
+                       (2 * (COOLDOWN_FRAMES + UP_FRAMES) - 1, 0)]
+
+
+# Over budget at level 0, plenty of headroom at level 1: each failed
+# try of level 0 doubles the wait before the next one
+def test_failed_level_waits_longer_each_time():
+    costs = [BUDGET_MS * 1.5] + [BUDGET_MS * HEADROOM * 0.5] * (len(QUALITY_LEVELS) - 1)
+    controller = QualityController(BUDGET_MS)
+    changes = run(controller, lambda level: costs[level], 20000)
+    ups = [frame for frame, level in changes if level == 0]
+    waits = [later - earlier for earlier, later in zip(ups, ups[1:])]
+    assert len(ups) >= 3
+    assert all(later > earlier for earlier, later in zip(waits, waits[1:]))
+    assert controller.up_frames[0] == UP_FRAMES * 2 ** len(ups)
+    assert all(level in (0, 1) for _, level in changes)
@@ -0,0 +1,67 @@
+import pytest
+from game_core import Game, Inputs, NO_INPUT
+from replay import (ReplayRecorder, ReplayError, game_flags, load_replay, fast_forward, state_digest,
+                    encode_inputs, decode_inputs, PREDICT_FLAG)
+from test_game_core import SEEDS, scripted_inputs, state
+
+
+def record(game, seed, path, ticks=2000):
+    recorder = ReplayRecorder(game.seed, game_flags(game))
+    for inputs in scripted_inputs(seed, ticks):
+        recorder.record(game.tick, inputs)
+        game.step(inputs)
+    recorder.save(path, game)
+    return load_replay(path)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("collision", ["test", "predict"])
+def test_replay_round_trip(tmp_path, collision, seed):
+    game = Game(seed=seed, collision=collision)
+    replay = record(game, seed, tmp_path / "run.crr")
+    assert bool(replay.flags & PREDICT_FLAG) == (collision == "predict")
+    replayed = fast_forward(replay)
+    assert replayed.collision == collision
+    assert replay.verify(replayed)
+    assert state(replayed) == state(game)
+    assert state_digest(replayed) == state_digest(game)
+
+
+def test_other_inputs_dont_verify(tmp_path):
+    replay = record(Game(seed=1), 1, tmp_path / "run.crr")
+    game = replay.new_game()
+    for tick in range(replay.end_tick):
+        game.step(NO_INPUT)
+    assert not replay.verify(game)
+
+
+def test_inputs_encode_and_decode():
+    for move in range(5):
+        for release in (False, True):
+            for restart in (False, True):
+                inputs = Inputs(move, release, restart)
+                assert decode_inputs(encode_inputs(inputs)) == inputs
+
+
+def test_not_a_replay(tmp_path):
+    path = tmp_path / "bad.crr"
+    path.write_bytes(b"not a replay file")
+    with pytest.raises(ReplayError):
+        load_replay(path)
+
+
+def test_truncated_replay(tmp_path):
+    path = tmp_path / "run.crr"
+    record(Game(seed=1), 1, path, ticks=200)
+    path.write_bytes(path.read_bytes()[:-6])
+    with pytest.raises(ReplayError):
+        load_replay(path)
+
+
+def test_quiet_ticks_cost_nothing(tmp_path):
+    game = Game(seed=1)
+    recorder = ReplayRecorder(game.seed)
+    for _ in range(1000):
+        recorder.record(game.tick, NO_INPUT)
+        game.step()
+    assert len(recorder.data) == len(ReplayRecorder(game.seed).data)